@@ -0,0 +1,41 @@
+"""
+Atomic File Writes
+
+Shared by the context scripts so the context file is always replaced the same
+way: written to a temp file in the target directory, synced, then renamed
+over the target.
+"""
+import os
+import tempfile
+
+def write_atomic(path, data):
+    """
+    Write encoded content to a temp file and rename it over the target.
+    
+    Args:
+        path: File path to create or replace
+        data: Bytes to write
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = 0o644
+    
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".md")
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
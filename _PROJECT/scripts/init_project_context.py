@@ -7,10 +7,45 @@ import os
 import json
 import datetime
 import shutil
+import hashlib
 import argparse
 import sys
 import re
 
+from atomic_write import write_atomic
+
+# Title line of the context template, e.g. "# PROJECT_NAME Project Context"
+_PROJECT_TITLE_RE = re.compile(rb'^# (.+) Project Context', re.MULTILINE)
+
+# Sidecar file in _PROJECT recording the initialization date and project
+_INIT_MARKER = ".tskmaster_init.json"
+
+# Last-updated line shipped in the context template
+_LAST_UPDATED_PLACEHOLDER = b"**Last Updated: 2025-04-03**"
+
+def _splice(content, replacements):
+    """
+    Build new content by replacing regions of the original in a single join.
+    
+    Args:
+        content: Original bytes
+        replacements: (start, end, replacement) tuples; overlapping regions
+            after the first are ignored
+            
+    Returns:
+        bytes: Content with the regions replaced
+    """
+    pieces = []
+    position = 0
+    for start, end, replacement in sorted(replacements):
+        if start < position:
+            continue
+        pieces.append(content[position:start])
+        pieces.append(replacement)
+        position = end
+    pieces.append(content[position:])
+    return b"".join(pieces)
+
 def initialize_project_context(project_name=None, force=False):
     """
     Initialize the project context system for TSKMaster.
@@ -32,14 +67,27 @@ def initialize_project_context(project_name=None, force=False):
         print("Please ensure TSKMaster_CONTEXT.md template file exists in the _PROJECT directory")
         return False
 
+    # Skip reading and parsing the template when the init marker is newer than it
+    marker_file = os.path.join(project_dir, _INIT_MARKER)
+    if not force:
+        try:
+            if os.stat(marker_file).st_mtime >= os.stat(context_file).st_mtime:
+                with open(marker_file, "r", encoding="utf-8") as f:
+                    marker = json.load(f)
+                print(f"Project context already initialized on {marker['date']}")
+                print("Use --force to reinitialize")
+                return False
+        except (OSError, ValueError, KeyError):
+            pass
+    
     # Update the metadata section
-    with open(context_file, "r", encoding="utf-8") as f:
+    with open(context_file, "rb") as f:
         content = f.read()
     
     # Find metadata section
-    meta_start = content.find("### Metadata")
-    meta_json_start = content.find("```json", meta_start)
-    meta_json_end = content.find("```", meta_json_start + 7)
+    meta_start = content.find(b"### Metadata")
+    meta_json_start = content.find(b"```json", meta_start)
+    meta_json_end = content.find(b"```", meta_json_start + 7)
     
     if meta_start > 0 and meta_json_start > 0 and meta_json_end > 0:
         # Extract current metadata
@@ -54,7 +102,8 @@ def initialize_project_context(project_name=None, force=False):
                 return False
             
             # Update metadata
-            metadata["initialized_date"] = datetime.datetime.now().strftime("%Y-%m-%d")
+            today = datetime.datetime.now().strftime("%Y-%m-%d")
+            metadata["initialized_date"] = today
             
             # Get project name if not provided
             if not project_name:
@@ -67,34 +116,34 @@ def initialize_project_context(project_name=None, force=False):
                 metadata["project_id"] = project_name
             else:
                 metadata["project_id"] = "TSKMaster"
-                
+            
             # Replace metadata in content
-            new_metadata = json.dumps(metadata, indent=2)
-            new_content = (
-                content[:meta_json_start+7] + 
-                "\n" + new_metadata + "\n" + 
-                content[meta_json_end:]
-            )
+            new_metadata = json.dumps(metadata, indent=2).encode("utf-8")
+            replacements = [(meta_json_start + 7, meta_json_end, b"\n" + new_metadata + b"\n")]
             
             # Update project name in title
-            project_title_pattern = re.compile(r'^# (.+) Project Context', re.MULTILINE)
-            new_content = project_title_pattern.sub(f'# {metadata["project_id"]} Project Context', new_content)
+            new_title = f'# {metadata["project_id"]} Project Context'.encode("utf-8")
+            for match in _PROJECT_TITLE_RE.finditer(content):
+                replacements.append((match.start(), match.end(), new_title))
             
             # Update last updated date
-            today = datetime.datetime.now().strftime('%Y-%m-%d')
-            new_content = new_content.replace(
-                "**Last Updated: 2025-04-03**",
-                f"**Last Updated: {today}**"
-            )
+            new_last_updated = f"**Last Updated: {today}**".encode("utf-8")
+            last_updated = content.find(_LAST_UPDATED_PLACEHOLDER)
+            while last_updated >= 0:
+                last_updated_end = last_updated + len(_LAST_UPDATED_PLACEHOLDER)
+                replacements.append((last_updated, last_updated_end, new_last_updated))
+                last_updated = content.find(_LAST_UPDATED_PLACEHOLDER, last_updated_end)
             
-            # Write updated content
-            with open(context_file, "w", encoding="utf-8") as f:
-                f.write(new_content)
+            # Write updated content, splicing only the changed regions
+            write_atomic(context_file, _splice(content, replacements))
             
             # Also update the main PROJECT_CONTEXT.md file
             main_context_file = os.path.join(project_dir, "PROJECT_CONTEXT.md")
-            with open(main_context_file, "w", encoding="utf-8") as f:
-                f.write(new_content)
+            shutil.copyfile(context_file, main_context_file)
+            
+            # Record the initialization so later runs can skip the parse
+            with open(marker_file, "w", encoding="utf-8") as f:
+                json.dump({"date": today, "project": metadata["project_id"]}, f)
                 
             print(f"Project context initialized for: {metadata['project_id']}")
             return True
@@ -133,6 +182,18 @@ fi
 exit 0
 """
     pre_commit_path = os.path.join(hooks_dir, "pre-commit")
+    
+    # Skip the rewrite when an identical executable hook is already installed
+    new_hash = hashlib.blake2b(pre_commit_content.encode("utf-8"), digest_size=16).digest()
+    try:
+        with open(pre_commit_path, "rb") as f:
+            old_hash = hashlib.blake2b(f.read(), digest_size=16).digest()
+        if old_hash == new_hash and os.stat(pre_commit_path).st_mode & 0o111:
+            print("Git hooks already up to date")
+            return True
+    except OSError:
+        pass
+    
     try:
         with open(pre_commit_path, "w") as f:
             f.write(pre_commit_content)
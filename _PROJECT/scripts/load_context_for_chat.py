@@ -5,13 +5,315 @@ Context Loader for AI Chat Sessions
 This script prepares the PROJECT_CONTEXT.md file and recent decision logs
 for easy attachment to AI chat sessions.
 """
+import io
 import os
 import re
 import json
+import mmap
 import datetime
+import heapq
 import argparse
 import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Use tiktoken for exact token counts but provide fallback
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Numbered top-level headings ("## 4. System Architecture") of PROJECT_CONTEXT.md
+_NUMBERED_HEADER_RE = re.compile(rb'^## (\d+)\.[ \t]*([^\r\n]*)', re.MULTILINE)
+
+# Blueprint title line and second-level section headings
+_TITLE_RE = re.compile(r'^# (.+)$', re.MULTILINE)
+_SECTION_RE = re.compile(r'^## ', re.MULTILINE)
+
+# Decisions table header and separator, up to the newline before the first row
+_DECISIONS_TABLE_RE = re.compile(
+    r'\| Date \| Component \| Decision \| Rationale \|.*?\|---.*?(?=\n\|)', 
+    re.DOTALL
+)
+
+# Whitespace skipped before the first decisions row
+_LEADING_SPACE_RE = re.compile(r'\s*')
+
+# Characters read from the start of a blueprint before falling back to a full read
+_BLUEPRINT_HEAD_CHARS = 8192
+
+# (number, title) of the numbered sections included in the chat context
+_CONTEXT_SECTIONS = (
+    (1, "Current Focus"),
+    (2, "Agent Profile"),
+    (3, "Project Scope"),
+    (4, "System Architecture"),
+)
+
+# Number of the "## 12. Decision Log" section, which runs to the end of the file
+_DECISION_LOG_NUMBER = 12
+
+# Heading numbers the fixed schema reads: each section's start and end, and the decision log
+_SCHEMA_HEADERS = frozenset(
+    [number for number, _ in _CONTEXT_SECTIONS]
+    + [number + 1 for number, _ in _CONTEXT_SECTIONS]
+    + [_DECISION_LOG_NUMBER]
+)
+
+# Parsed files keyed by path: {path: ((mtime_ns, size), parsed)}
+_CONTEXT_CACHE = {}
+_BLUEPRINT_CACHE = {}
+
+# Token counts keyed by (section name, section content)
+_TOKEN_CACHE = {}
+_ENCODING = None
+
+def _count_tokens(section_name, section_content):
+    """
+    Count the tokens of a context section, caching the result.
+    
+    Uses the cl100k_base encoding when tiktoken is available, otherwise
+    the rough approximation of 4 characters per token.
+    
+    Args:
+        section_name: Name of the section
+        section_content: Section text
+        
+    Returns:
+        int: Token count
+    """
+    global _ENCODING, TIKTOKEN_AVAILABLE
+    key = (section_name, section_content)
+    count = _TOKEN_CACHE.get(key)
+    if count is not None:
+        return count
+    
+    if TIKTOKEN_AVAILABLE and _ENCODING is None:
+        try:
+            _ENCODING = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            print(f"Warning: Could not load tiktoken encoding, estimating tokens: {e}")
+            TIKTOKEN_AVAILABLE = False
+    
+    if TIKTOKEN_AVAILABLE:
+        count = len(_ENCODING.encode(section_content, disallowed_special=()))
+    else:
+        # Estimate tokens (rough approximation: 4 chars ≈ 1 token)
+        count = len(section_content) // 4
+    
+    _TOKEN_CACHE[key] = count
+    return count
+
+def _first_lines(text, start, count):
+    """
+    Return the first lines of text after an offset without splitting the rest.
+    
+    Args:
+        text: Text to read from
+        start: Offset to start at; leading whitespace is skipped
+        count: Maximum number of lines to return
+        
+    Returns:
+        str: Up to count lines joined by newlines
+    """
+    first = _LEADING_SPACE_RE.match(text, start).end()
+    end = first
+    for _ in range(count):
+        newline = text.find("\n", end)
+        if newline < 0:
+            return text[first:].rstrip()
+        end = newline + 1
+    return text[first:end - 1]
+
+def _prefetch(paths):
+    """
+    Ask the kernel to start reading files ahead of sequential access.
+    
+    No-op on platforms without posix_fadvise.
+    
+    Args:
+        paths: File paths that are about to be read
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+def _file_signature(path):
+    """Return the (mtime_ns, size) pair used to validate cached parse results."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+def _iter_markdown_files(root):
+    """
+    Recursively yield markdown files below a directory.
+    
+    Args:
+        root: Directory to walk
+        
+    Yields:
+        tuple: (path, mtime) read from the cached directory entry stat
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_markdown_files(entry.path)
+            elif entry.name.endswith(".md"):
+                yield entry.path, entry.stat().st_mtime
+
+def _decode_section(data):
+    """Decode a section of the mapped context file into normalized text."""
+    return data.decode("utf-8").replace("\r\n", "\n").strip()
+
+def _parse_context_sections(context_data):
+    """
+    Split PROJECT_CONTEXT.md into the sections used for chat context.
+    
+    Args:
+        context_data: Raw bytes (or memory map) of PROJECT_CONTEXT.md
+        
+    Returns:
+        list: (section name, section content) tuples in output order
+    """
+    # Index the schema's numbered "## N." headings in a single pass, stopping
+    # as soon as every heading the fixed schema needs has been seen
+    headers = {}
+    for match in _NUMBERED_HEADER_RE.finditer(context_data):
+        number = int(match.group(1))
+        if number in _SCHEMA_HEADERS and number not in headers:
+            headers[number] = (match.start(), match.group(2).decode("utf-8"))
+            if len(headers) == len(_SCHEMA_HEADERS):
+                break
+    
+    sections = []
+    
+    # Add the header section (metadata, overview)
+    header_end = headers.get(1, (-1, ""))[0]
+    if header_end > 0:
+        header = _decode_section(context_data[:header_end])
+        sections.append(("Header", header))
+    
+    # Add current focus, agent profile, project scope and architecture sections
+    for number, title in _CONTEXT_SECTIONS:
+        section_start, heading = headers.get(number, (-1, ""))
+        next_section = headers.get(number + 1, (-1, ""))[0]
+        if section_start > 0 and next_section > section_start and heading.startswith(title):
+            sections.append((title, _decode_section(context_data[section_start:next_section])))
+    
+    # Add decision log
+    decision_start, heading = headers.get(_DECISION_LOG_NUMBER, (-1, ""))
+    if decision_start > 0 and heading.startswith("Decision Log"):
+        decisions = _decode_section(context_data[decision_start:])
+        sections.append(("Decision Log", decisions))
+    
+    return sections
+
+def _map_context_sections(context_file):
+    """
+    Parse the sections of PROJECT_CONTEXT.md through a read-only memory map.
+    
+    Only the selected sections are copied out of the mapping and decoded.
+    
+    Args:
+        context_file: Path to PROJECT_CONTEXT.md
+        
+    Returns:
+        list: (section name, section content) tuples in output order
+    """
+    fd = os.open(context_file, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            return []
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        try:
+            return _parse_context_sections(mm)
+        finally:
+            mm.close()
+    finally:
+        os.close(fd)
+
+def _extract_blueprint_summary(bp_content, bp_file, partial=False):
+    """
+    Extract the title and overview from blueprint markdown.
+    
+    Args:
+        bp_content: Blueprint text, possibly only the start of the file
+        bp_file: Path to the blueprint markdown file
+        partial: Whether bp_content is a prefix of the file
+        
+    Returns:
+        tuple: (title, overview), or None if a partial prefix is not enough
+    """
+    # Extract title and overview
+    title_match = _TITLE_RE.search(bp_content)
+    if partial and (title_match is None or title_match.end() >= len(bp_content)):
+        return None
+    title = title_match.group(1) if title_match else os.path.basename(bp_file)
+    
+    # Locate the first section and the overview section in one pass over the headings
+    overview = ""
+    first_section = -1
+    overview_start = -1
+    for match in _SECTION_RE.finditer(bp_content):
+        if first_section < 0:
+            first_section = match.start()
+        if overview_start > 0:
+            overview = bp_content[overview_start:match.start()].strip()
+            break
+        if match.start() > 0 and bp_content.startswith("## Overview", match.start()):
+            overview_start = match.start()
+    else:
+        if partial:
+            # The overview may continue, or only appear, past the prefix
+            return None
+        if overview_start > 0:
+            overview = bp_content[overview_start:].strip()
+    
+    if not overview:
+        # Just take the first 300 characters after the title
+        if first_section >= 0:
+            overview = bp_content[first_section:first_section+300].strip()
+        else:
+            overview = bp_content[:300].strip()
+    
+    return title, overview
+
+def _summarize_blueprint(bp_file):
+    """
+    Extract the title and overview of a blueprint file, using the cache when unchanged.
+    
+    Only the start of the file is read unless the summary extends past it.
+    
+    Args:
+        bp_file: Path to the blueprint markdown file
+        
+    Returns:
+        tuple: (title, overview)
+    """
+    signature = _file_signature(bp_file)
+    cached = _BLUEPRINT_CACHE.get(bp_file)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    with open(bp_file, "r", encoding="utf-8") as f:
+        bp_content = f.read(_BLUEPRINT_HEAD_CHARS)
+        partial = len(bp_content) == _BLUEPRINT_HEAD_CHARS
+        summary = _extract_blueprint_summary(bp_content, bp_file, partial)
+        if summary is None:
+            bp_content += f.read()
+            summary = _extract_blueprint_summary(bp_content, bp_file)
+    
+    _BLUEPRINT_CACHE[bp_file] = (signature, summary)
+    return summary
 
 def load_context_for_chat(include_decisions=True, include_blueprints=True, 
                           output_file=None, max_tokens=8000):
@@ -36,129 +338,72 @@ def load_context_for_chat(include_decisions=True, include_blueprints=True,
         print(f"Error: {context_file} not found")
         return None
     
-    with open(context_file, "r", encoding="utf-8") as f:
-        context_content = f.read()
-    
-    # Collect the sections we want to include
-    sections = []
-    
-    # Add the header section (metadata, overview)
-    header_end = context_content.find("## 1.")
-    if header_end > 0:
-        header = context_content[:header_end].strip()
-        sections.append(("Header", header))
-    
-    # Add current focus section
-    focus_start = context_content.find("## 1. Current Focus")
-    if focus_start > 0:
-        next_section = context_content.find("## 2.", focus_start)
-        if next_section > 0:
-            focus = context_content[focus_start:next_section].strip()
-            sections.append(("Current Focus", focus))
-    
-    # Add agent profile section
-    agent_start = context_content.find("## 2. Agent Profile")
-    if agent_start > 0:
-        next_section = context_content.find("## 3.", agent_start)
-        if next_section > 0:
-            agent = context_content[agent_start:next_section].strip()
-            sections.append(("Agent Profile", agent))
-    
-    # Add project scope section
-    scope_start = context_content.find("## 3. Project Scope")
-    if scope_start > 0:
-        next_section = context_content.find("## 4.", scope_start)
-        if next_section > 0:
-            scope = context_content[scope_start:next_section].strip()
-            sections.append(("Project Scope", scope))
-    
-    # Add architecture section
-    arch_start = context_content.find("## 4. System Architecture")
-    if arch_start > 0:
-        next_section = context_content.find("## 5.", arch_start)
-        if next_section > 0:
-            arch = context_content[arch_start:next_section].strip()
-            sections.append(("System Architecture", arch))
-    
-    # Add decision log if requested
-    if include_decisions:
-        decision_start = context_content.find("## 12. Decision Log")
-        if decision_start > 0:
-            decisions = context_content[decision_start:].strip()
-            sections.append(("Decision Log", decisions))
-        
-        # Also check for separate decisions log file
-        decisions_file = os.path.join(project_dir, "DECISIONS_LOG.md")
-        if os.path.exists(decisions_file):
-            with open(decisions_file, "r", encoding="utf-8") as f:
-                decisions_content = f.read()
-                
-            # Extract the most recent decisions (first 5)
-            decisions_table_start = decisions_content.find("| Date | Component | Decision | Rationale |")
-            if decisions_table_start > 0:
-                table_start = decisions_content.find("|---", decisions_table_start)
-                if table_start > 0:
-                    rows_start = decisions_content.find("\n|", table_start)
-                    if rows_start > 0:
-                        # Get the first 5 rows
-                        lines = decisions_content[rows_start:].strip().split("\n")
-                        recent_decisions = "\n".join(lines[:6])  # Header + 5 rows
-                        sections.append(("Recent Decisions", 
-                                        "## Recent Architectural Decisions\n\n" + recent_decisions))
+    # Resolve the decisions log and the 3 most recent blueprints up front
+    decisions_file = os.path.join(project_dir, "DECISIONS_LOG.md")
+    read_decisions = include_decisions and os.path.exists(decisions_file)
     
-    # Add blueprint summaries if requested
+    recent_blueprints = []
     if include_blueprints:
         blueprints_dir = os.path.join(project_dir, "_BMPRSS/_BLUEPRINTS")
         if os.path.exists(blueprints_dir):
-            blueprint_files = list(Path(blueprints_dir).glob("**/*.md"))
+            recent_blueprints = [
+                bp_file for bp_file, _ in heapq.nlargest(
+                    3, 
+                    _iter_markdown_files(blueprints_dir), 
+                    key=lambda item: item[1]
+                )
+            ]
+    
+    # Let the kernel read ahead all files while the first one is processed
+    _prefetch([context_file] + ([decisions_file] if read_decisions else []) + recent_blueprints)
+    
+    # Reuse the parsed sections while the file is unchanged on disk
+    signature = _file_signature(context_file)
+    cached = _CONTEXT_CACHE.get(context_file)
+    if cached is not None and cached[0] == signature:
+        parsed_sections = cached[1]
+    else:
+        parsed_sections = _map_context_sections(context_file)
+        _CONTEXT_CACHE[context_file] = (signature, parsed_sections)
+    
+    # Collect the sections we want to include
+    sections = [
+        (name, content) for name, content in parsed_sections
+        if include_decisions or name != "Decision Log"
+    ]
+    
+    # Also check for separate decisions log file
+    if read_decisions:
+        with open(decisions_file, "r", encoding="utf-8") as f:
+            decisions_content = f.read()
             
-            if blueprint_files:
-                recent_blueprints = sorted(
-                    blueprint_files, 
-                    key=os.path.getmtime, 
-                    reverse=True
-                )[:3]  # Get 3 most recent blueprints
-                
-                blueprint_summaries = ["## Active Blueprints\n"]
-                
-                for bp_file in recent_blueprints:
-                    with open(bp_file, "r", encoding="utf-8") as f:
-                        bp_content = f.read()
-                    
-                    # Extract title and overview
-                    title_match = re.search(r'^# (.+)$', bp_content, re.MULTILINE)
-                    title = title_match.group(1) if title_match else os.path.basename(bp_file)
-                    
-                    # Extract overview section
-                    overview = ""
-                    overview_start = bp_content.find("## Overview")
-                    if overview_start > 0:
-                        next_section = re.search(r'^## ', bp_content[overview_start+10:], re.MULTILINE)
-                        if next_section:
-                            end_pos = overview_start + 10 + next_section.start()
-                            overview = bp_content[overview_start:end_pos].strip()
-                        else:
-                            overview = bp_content[overview_start:].strip()
-                    
-                    if not overview:
-                        # Just take the first 300 characters after the title
-                        first_section = re.search(r'^## ', bp_content, re.MULTILINE)
-                        if first_section:
-                            overview = bp_content[first_section.start():first_section.start()+300].strip()
-                        else:
-                            overview = bp_content[:300].strip()
-                    
-                    blueprint_summaries.append(f"### {title}\n\n{overview}\n")
-                
-                sections.append(("Blueprints", "\n\n".join(blueprint_summaries)))
+        # Extract the most recent decisions (first 5)
+        table_match = _DECISIONS_TABLE_RE.search(decisions_content)
+        if table_match and table_match.start() > 0:
+            # Get the first 5 rows
+            recent_decisions = _first_lines(decisions_content, table_match.end(), 6)  # Header + 5 rows
+            sections.append(("Recent Decisions", 
+                            "## Recent Architectural Decisions\n\n" + recent_decisions))
+    
+    # Add blueprint summaries if requested
+    if recent_blueprints:
+        blueprint_summaries = ["## Active Blueprints\n"]
+        
+        # Read the blueprints concurrently; map() keeps the recency order
+        with ThreadPoolExecutor(max_workers=len(recent_blueprints)) as executor:
+            summaries = list(executor.map(_summarize_blueprint, recent_blueprints))
+        
+        for title, overview in summaries:
+            blueprint_summaries.append(f"### {title}\n\n{overview}\n")
+        
+        sections.append(("Blueprints", "\n\n".join(blueprint_summaries)))
     
     # Create final context content with all sections
     final_content = []
     token_estimate = 0
     
     for section_name, section_content in sections:
-        # Estimate tokens (rough approximation: 4 chars ≈ 1 token)
-        section_tokens = len(section_content) // 4
+        section_tokens = _count_tokens(section_name, section_content)
         
         if token_estimate + section_tokens > max_tokens:
             # Don't add this section if it would exceed the max tokens
@@ -168,22 +413,26 @@ def load_context_for_chat(include_decisions=True, include_blueprints=True,
         final_content.append(section_content)
         token_estimate += section_tokens
     
-    combined_content = "\n\n---\n\n".join(final_content)
+    buffer = io.StringIO()
+    for index, section_content in enumerate(final_content):
+        if index:
+            buffer.write("\n\n---\n\n")
+        buffer.write(section_content)
     
     # Add a note about tokenization
-    note = f"\n\n<!-- Approximate token count: {token_estimate} -->"
-    combined_content += note
+    buffer.write(f"\n\n<!-- Approximate token count: {token_estimate} -->")
+    combined_content = buffer.getvalue()
     
     # Write to file or output to console
     if output_file:
-        with open(output_file, "w", encoding="utf-8") as f:
+        with open(output_file, "w", encoding="utf-8", buffering=1 << 20) as f:
             f.write(combined_content)
         print(f"Context written to {output_file}")
     else:
-        print("\n" + "="*80)
-        print("PROJECT CONTEXT FOR CHAT SESSION")
-        print("="*80 + "\n")
-        print(combined_content)
+        banner = "="*80
+        sys.stdout.write(f"\n{banner}\nPROJECT CONTEXT FOR CHAT SESSION\n{banner}\n\n")
+        sys.stdout.write(combined_content)
+        sys.stdout.write("\n")
     
     return combined_content
 
@@ -11,8 +11,41 @@ import re
 import json
 import datetime
 import argparse
+import bisect
 import difflib
-import glob
+import functools
+import operator
+from concurrent.futures import ProcessPoolExecutor
+
+# Blueprint document extensions, in the order they are analyzed
+_BLUEPRINT_EXTENSIONS = (".md", ".txt", ".json")
+
+# Implementation files considered components
+_SOURCE_EXTENSIONS = ('.py', '.js', '.jsx', '.ts', '.tsx', '.c', '.cpp', '.h')
+
+# Blueprint count from which blueprints are analyzed in worker processes
+_PARALLEL_MIN_BLUEPRINTS = 8
+
+# Rows of the DECISIONS_LOG.md table: date, component, decision, rationale
+_TABLE_RE = re.compile(r'\|\s*(\d{4}-\d{2}-\d{2})\s*\|\s*(.*?)\s*\|\s*(.*?)\s*\|\s*(.*?)\s*\|')
+
+# Blueprint component definitions
+_JSON_BLOCK_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+_COMP_HEADING_RE = re.compile(r'#+\s*Components?|Modules?|Structure', re.IGNORECASE)
+_COMP_NAME_RE = re.compile(r'#+\s*([\w\-\.]+)\s*')
+_PATH_RE = re.compile(r'(path|file|location):\s*[\'"]?([\w\-\.\/]+)[\'"]?', re.IGNORECASE)
+_ARROW_RE = re.compile(r'\s*(?:->|:)\s*')
+
+# Implementation decision comments and blueprint function definitions
+_DECISION_RE = re.compile(r'(?:\/\/|#)\s*DECISION:\s*(.*?)(?:\n|$)')
+_FUNC_RE = re.compile(r'(?:def|function)\s+(\w+)')
+_IDENTIFIER_RE = re.compile(r'\w+')
+
+# Markdown headings of level 2 and below in PROJECT_CONTEXT.md
+_HEADING_RE = re.compile(r'^##', re.MULTILINE)
+
+# Fenced code blocks in markdown, from an opening ``` line to the next ``` line
+_SNIPPET_RE = re.compile(r'^```[^\n]*\n(.*?)^```', re.DOTALL | re.MULTILINE)
 
 def track_blueprint_decisions(blueprints_dir="_BMPRSS/_BLUEPRINTS", 
                              output_file="../DECISIONS_LOG.md"):
@@ -33,6 +66,7 @@ def track_blueprint_decisions(blueprints_dir="_BMPRSS/_BLUEPRINTS",
     
     blueprints_full_path = os.path.join(project_root, blueprints_dir)
     output_full_path = os.path.join(project_root, output_file)
+    today = datetime.date.today().isoformat()
     
     if not os.path.exists(blueprints_full_path):
         print(f"Error: Blueprints directory '{blueprints_full_path}' not found")
@@ -50,8 +84,7 @@ def track_blueprint_decisions(blueprints_dir="_BMPRSS/_BLUEPRINTS",
         with open(output_full_path, "r", encoding="utf-8") as f:
             content = f.read()
             # Extract decisions from MD table format
-            table_pattern = r'\|\s*(\d{4}-\d{2}-\d{2})\s*\|\s*(.*?)\s*\|\s*(.*?)\s*\|\s*(.*?)\s*\|'
-            matches = re.findall(table_pattern, content)
+            matches = _TABLE_RE.findall(content)
             for match in matches:
                 if len(match) >= 4:
                     existing_decisions.append({
@@ -61,70 +94,43 @@ def track_blueprint_decisions(blueprints_dir="_BMPRSS/_BLUEPRINTS",
                         "rationale": match[3]
                     })
     
+    # Index tracked decisions for constant-time lookups
+    existing_keys = {(e["component"], e["decision"]) for e in existing_decisions}
+    
     # Find all blueprint files
-    blueprint_files = []
-    for ext in ["*.md", "*.txt", "*.json"]:
-        blueprint_files.extend(glob.glob(os.path.join(blueprints_full_path, "**", ext), recursive=True))
+    blueprint_files = _find_blueprint_files(blueprints_full_path)
     
     print(f"Found {len(blueprint_files)} blueprint files")
     
-    # Compare blueprints with current implementation
-    for blueprint_file in blueprint_files:
-        relative_path = os.path.relpath(blueprint_file, blueprints_full_path)
-        print(f"Analyzing {relative_path}...")
-        
-        with open(blueprint_file, "r", encoding="utf-8") as f:
-            blueprint_content = f.read()
-        
-        # Extract planned components and architecture from blueprint
-        components = extract_components_from_blueprint(blueprint_content)
+    # Compare blueprints with current implementation; blueprints are
+    # independent, so larger sets are analyzed in worker processes
+    analyze = functools.partial(
+        _analyze_blueprint, 
+        blueprints_full_path=blueprints_full_path, 
+        workspace_root=workspace_root
+    )
+    if len(blueprint_files) >= _PARALLEL_MIN_BLUEPRINTS:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(analyze, blueprint_files, chunksize=8))
+    else:
+        results = [analyze(blueprint_file) for blueprint_file in blueprint_files]
+    
+    components = []
+    for messages, components, blueprint_decisions in results:
+        for message in messages:
+            print(message)
         
-        for component in components:
-            # Check if component exists in implementation
-            implemented_path = component.get("path")
-            if implemented_path:
-                # Convert to full path relative to workspace
-                full_path = os.path.join(workspace_root, implemented_path)
-                if os.path.exists(full_path):
-                    # Component exists, check for differences
-                    with open(full_path, "r", encoding="utf-8") as f:
-                        implemented_content = f.read()
-                    
-                    changes = compare_blueprint_vs_implementation(
-                        component, 
-                        blueprint_content, 
-                        implemented_content
-                    )
-                    
-                    for change in changes:
-                        # Check if this decision is already tracked
-                        is_new = True
-                        for existing in existing_decisions:
-                            if (existing["component"] == change["component"] and
-                                existing["decision"] == change["decision"]):
-                                is_new = False
-                                break
-                        
-                        if is_new:
-                            change["date"] = datetime.datetime.now().strftime("%Y-%m-%d")
-                            decisions.append(change)
-                else:
-                    # Check if planned component was removed/renamed
-                    print(f"  Warning: Planned component {component.get('name')} not found at {full_path}")
-                    # Add a record about missing component if it's not just a directory
-                    if not implemented_path.endswith('/'):
-                        decisions.append({
-                            "date": datetime.datetime.now().strftime("%Y-%m-%d"),
-                            "component": component.get("name", "Unknown"),
-                            "decision": f"Component planned at {implemented_path} not implemented",
-                            "rationale": "Decision needed: Intentionally removed or moved elsewhere?"
-                        })
+        for is_change, decision in blueprint_decisions:
+            # Check if this decision is already tracked
+            if not is_change or (decision["component"], decision["decision"]) not in existing_keys:
+                decision["date"] = today
+                decisions.append(decision)
     
     # Also scan for new components not in blueprints
     new_components = find_new_components(workspace_root, components)
     for component in new_components:
         decisions.append({
-            "date": datetime.datetime.now().strftime("%Y-%m-%d"),
+            "date": today,
             "component": component["name"],
             "decision": f"Added component not in original blueprints: {component['path']}",
             "rationale": "Decision needed: Document rationale for this addition"
@@ -134,23 +140,27 @@ def track_blueprint_decisions(blueprints_dir="_BMPRSS/_BLUEPRINTS",
     all_decisions = existing_decisions + decisions
     
     # Sort by date (newest first)
-    all_decisions.sort(key=lambda x: x["date"], reverse=True)
+    all_decisions.sort(key=operator.itemgetter("date"), reverse=True)
     
     # Ensure directory exists
     os.makedirs(os.path.dirname(output_full_path), exist_ok=True)
     
+    # Build the log in memory and write it in one call
+    log_lines = [
+        "# Project Architectural Decisions Log\n",
+        f"**Last Updated:** {today}\n",
+        "This document tracks significant architectural decisions made during implementation",
+        "that differ from the original blueprints.\n",
+        "| Date | Component | Decision | Rationale |",
+        "|------|-----------|----------|------------|",
+    ]
+    for decision in all_decisions:
+        log_lines.append(f"| {decision['date']} | {decision['component']} | {decision['decision']} | {decision['rationale']} |")
+    log_lines.append("")
+    
     # Write to output file
     with open(output_full_path, "w", encoding="utf-8") as f:
-        f.write(f"# Project Architectural Decisions Log\n\n")
-        f.write(f"**Last Updated:** {datetime.datetime.now().strftime('%Y-%m-%d')}\n\n")
-        f.write("This document tracks significant architectural decisions made during implementation\n")
-        f.write("that differ from the original blueprints.\n\n")
-        
-        f.write("| Date | Component | Decision | Rationale |\n")
-        f.write("|------|-----------|----------|------------|\n")
-        
-        for decision in all_decisions:
-            f.write(f"| {decision['date']} | {decision['component']} | {decision['decision']} | {decision['rationale']} |\n")
+        f.write("\n".join(log_lines))
     
     print(f"Found {len(decisions)} new decisions")
     print(f"Decisions log written to {output_full_path}")
@@ -161,6 +171,125 @@ def track_blueprint_decisions(blueprints_dir="_BMPRSS/_BLUEPRINTS",
     
     return True
 
+def _analyze_blueprint(blueprint_file, blueprints_full_path, workspace_root):
+    """
+    Compare one blueprint document with the current implementation.
+    
+    Runs in a worker process for large blueprint sets, so progress messages
+    are returned rather than printed.
+    
+    Returns:
+        tuple: (messages, components, decisions) where decisions is a list of
+            undated (is_change, decision) pairs; changes still need to be
+            checked against the tracked decisions
+    """
+    messages = []
+    decisions = []
+    
+    relative_path = os.path.relpath(blueprint_file, blueprints_full_path)
+    messages.append(f"Analyzing {relative_path}...")
+    
+    with open(blueprint_file, "r", encoding="utf-8") as f:
+        blueprint_content = f.read()
+    
+    # Extract planned components and architecture from blueprint
+    components = extract_components_from_blueprint(blueprint_content)
+    
+    for component in components:
+        # Check if component exists in implementation
+        implemented_path = component.get("path")
+        if implemented_path:
+            # Convert to full path relative to workspace
+            full_path = os.path.join(workspace_root, implemented_path)
+            if os.path.exists(full_path):
+                # Component exists, check for differences
+                with open(full_path, "r", encoding="utf-8") as f:
+                    implemented_content = f.read()
+                
+                changes = compare_blueprint_vs_implementation(
+                    component, 
+                    blueprint_content, 
+                    implemented_content
+                )
+                decisions.extend((True, change) for change in changes)
+            else:
+                # Check if planned component was removed/renamed
+                messages.append(f"  Warning: Planned component {component.get('name')} not found at {full_path}")
+                # Add a record about missing component if it's not just a directory
+                if not implemented_path.endswith('/'):
+                    decisions.append((False, {
+                        "component": component.get("name", "Unknown"),
+                        "decision": f"Component planned at {implemented_path} not implemented",
+                        "rationale": "Decision needed: Intentionally removed or moved elsewhere?"
+                    }))
+    
+    return messages, components, decisions
+
+def _find_blueprint_files(blueprints_dir):
+    """
+    Find blueprint documents in a single walk of the blueprints directory.
+    
+    Hidden files and directories are skipped, and files are grouped by
+    extension in the order .md, .txt, .json.
+    
+    Returns:
+        list: Blueprint file paths
+    """
+    by_ext = {ext: [] for ext in _BLUEPRINT_EXTENSIONS}
+    for root, dirs, files in os.walk(blueprints_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for file in files:
+            ext = os.path.splitext(file)[1]
+            if ext in by_ext and not file.startswith('.'):
+                by_ext[ext].append(os.path.join(root, file))
+    
+    return [path for ext in _BLUEPRINT_EXTENSIONS for path in by_ext[ext]]
+
+def _walk_files(top, rel_top):
+    """
+    Walk a directory tree with os.scandir, using the cached entry types.
+    
+    Like os.walk, each directory's files come before its subdirectories and
+    symlinked directories are not followed.
+    
+    Args:
+        top: Directory to walk
+        rel_top: Path of top relative to the workspace root
+    
+    Yields:
+        tuple: (directory path relative to the workspace root, file names)
+    """
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(top) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry.name)
+                elif not entry.is_symlink():
+                    subdirs.append(entry.name)
+    except OSError:
+        return
+    
+    yield rel_top, files
+    for name in subdirs:
+        yield from _walk_files(os.path.join(top, name), os.path.join(rel_top, name))
+
+def _iter_lines(content):
+    """Yield the newline-separated lines of content without building a list."""
+    start = 0
+    while True:
+        end = content.find('\n', start)
+        if end < 0:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
+
 def extract_components_from_blueprint(content):
     """
     Extract planned components from blueprint document.
@@ -171,8 +300,14 @@ def extract_components_from_blueprint(content):
     components = []
     
     # Try to extract from JSON blocks first
-    json_blocks = re.findall(r'```json\s*(.*?)\s*```', content, re.DOTALL)
+    json_blocks = _JSON_BLOCK_RE.findall(content)
     for json_block in json_blocks:
+        # Skip blocks that cannot define components without parsing them
+        if not json_block.startswith('{'):
+            continue
+        if not ('"components"' in json_block or '"COMPONENTS"' in json_block or
+                ('"name"' in json_block and '"path"' in json_block)):
+            continue
         try:
             data = json.loads(json_block)
             if isinstance(data, dict):
@@ -193,15 +328,15 @@ def extract_components_from_blueprint(content):
     component_section = False
     current_component = {}
     
-    for line in content.split('\n'):
+    for line in _iter_lines(content):
         # Check for component section headings
-        if re.match(r'#+\s*Components?|Modules?|Structure', line, re.IGNORECASE):
+        if _COMP_HEADING_RE.match(line):
             component_section = True
             continue
         
         if component_section:
             # Look for component name and path in various formats
-            comp_match = re.match(r'#+\s*([\w\-\.]+)\s*', line)
+            comp_match = _COMP_NAME_RE.match(line)
             if comp_match:
                 if current_component and "name" in current_component:
                     components.append(current_component)
@@ -209,13 +344,13 @@ def extract_components_from_blueprint(content):
                 continue
             
             # Look for path definitions
-            path_match = re.search(r'(path|file|location):\s*[\'"]?([\w\-\.\/]+)[\'"]?', line, re.IGNORECASE)
+            path_match = _PATH_RE.search(line)
             if path_match and current_component:
                 current_component["path"] = path_match.group(2)
             
             # Check for Python import style paths
             if "->" in line or ":" in line:
-                parts = re.split(r'\s*(?:->|:)\s*', line)
+                parts = _ARROW_RE.split(line)
                 if len(parts) >= 2:
                     if current_component and "name" in current_component:
                         components.append(current_component)
@@ -240,10 +375,7 @@ def compare_blueprint_vs_implementation(component, blueprint_content, implemente
     component_name = component.get("name", "Unknown")
     
     # Check for implementation comments indicating changes
-    decision_comments = re.findall(
-        r'(?:\/\/|#)\s*DECISION:\s*(.*?)(?:\n|$)', 
-        implemented_content
-    )
+    decision_comments = _DECISION_RE.findall(implemented_content)
     
     for comment in decision_comments:
         changes.append({
@@ -255,69 +387,80 @@ def compare_blueprint_vs_implementation(component, blueprint_content, implemente
     # Check for significant structural changes
     # This is a simplistic diff - could be enhanced for specific languages
     if len(changes) == 0:
-        blueprint_snippets = extract_code_snippets(blueprint_content)
+        # Index the implementation once and reuse it for every snippet
+        matcher = difflib.SequenceMatcher(None)
+        matcher.set_seq2(implemented_content)
+        impl_identifiers = None
         
-        for snippet in blueprint_snippets:
-            if len(snippet) > 10:  # Ignore very short snippets
-                # See if this snippet appears in implementation
-                similarity = difflib.SequenceMatcher(
-                    None, snippet, implemented_content
-                ).ratio()
-                
-                if similarity < 0.7:  # Less than 70% similar
-                    # Extract function names from blueprint
-                    bp_functions = re.findall(r'(?:def|function)\s+(\w+)', snippet)
-                    # Check if these functions exist in implementation
-                    for func in bp_functions:
-                        if func not in implemented_content:
-                            changes.append({
-                                "component": component_name,
-                                "decision": f"Function '{func}' from blueprint not implemented",
-                                "rationale": "Decision needed"
-                            })
+        for snippet, bp_functions in _blueprint_snippet_functions(blueprint_content):
+            # See if this snippet appears in implementation; the cheap upper
+            # bounds settle most snippets before the full ratio is needed
+            matcher.set_seq1(snippet)
+            
+            if (matcher.real_quick_ratio() < 0.7 or
+                    matcher.quick_ratio() < 0.7 or
+                    matcher.ratio() < 0.7):  # Less than 70% similar
+                if impl_identifiers is None:
+                    impl_identifiers = set(_IDENTIFIER_RE.findall(implemented_content))
+                # Check if these functions exist in implementation; a whole
+                # identifier match avoids the substring scan
+                for func in bp_functions:
+                    if func not in impl_identifiers and func not in implemented_content:
+                        changes.append({
+                            "component": component_name,
+                            "decision": f"Function '{func}' from blueprint not implemented",
+                            "rationale": "Decision needed"
+                        })
     
     return changes
 
+@functools.lru_cache(maxsize=8)
+def _blueprint_snippet_functions(blueprint_content):
+    """
+    Extract the code snippets of a blueprint with their function names.
+    
+    Cached because every component of a blueprint is compared against the
+    same snippets.
+    
+    Returns:
+        tuple: (snippet, function names) pairs for snippets over 10 characters
+    """
+    return tuple(
+        (snippet, tuple(_FUNC_RE.findall(snippet)))
+        for snippet in extract_code_snippets(blueprint_content)
+        if len(snippet) > 10  # Ignore very short snippets
+    )
+
 def extract_code_snippets(content):
     """Extract code snippets from markdown."""
-    snippets = []
-    in_snippet = False
-    current_snippet = []
-    
-    for line in content.split('\n'):
-        if line.startswith('```'):
-            if in_snippet:
-                in_snippet = False
-                if current_snippet:
-                    snippets.append('\n'.join(current_snippet))
-                    current_snippet = []
-            else:
-                in_snippet = True
-        elif in_snippet:
-            current_snippet.append(line)
-    
-    return snippets
+    # Each match holds the snippet lines with their trailing newlines;
+    # fences with no lines inside are skipped
+    return [
+        match.group(1)[:-1]
+        for match in _SNIPPET_RE.finditer(content)
+        if match.group(1)
+    ]
 
 def find_new_components(workspace_root, planned_components):
     """Find components in implementation not in blueprints."""
     new_components = []
-    planned_paths = [c.get("path") for c in planned_components if "path" in c]
+    planned_paths = {c.get("path") for c in planned_components if "path" in c}
+    planned_dirs = tuple(p for p in planned_paths if p.endswith('/'))
     
     # Check typical code directories
     code_dirs = ["src", "app", "lib", "components", "modules"]
     
     for code_dir in code_dirs:
         full_dir = os.path.join(workspace_root, code_dir)
-        if os.path.exists(full_dir) and os.path.isdir(full_dir):
-            for root, dirs, files in os.walk(full_dir):
+        if os.path.isdir(full_dir):
+            for rel_root, files in _walk_files(full_dir, code_dir):
                 for file in files:
-                    if file.endswith(('.py', '.js', '.jsx', '.ts', '.tsx', '.c', '.cpp', '.h')):
+                    if file.endswith(_SOURCE_EXTENSIONS):
                         # Get path relative to workspace root 
-                        path = os.path.relpath(os.path.join(root, file), workspace_root)
+                        path = os.path.join(rel_root, file)
                         if path not in planned_paths:
                             # Check if this path is covered by any parent dir in planned_paths
-                            parent_planned = any(path.startswith(p) for p in planned_paths if p.endswith('/'))
-                            if not parent_planned:
+                            if not path.startswith(planned_dirs):
                                 new_components.append({
                                     "name": os.path.splitext(file)[0],
                                     "path": path
@@ -340,31 +483,46 @@ def update_project_context_with_decisions(decisions):
         with open(context_file, "r", encoding="utf-8") as f:
             content = f.read()
         
-        # Find decision log section or create one
-        decisions_section = content.find("## 12. Decision Log")
+        # Index the headings in one pass, then find the decision log section
+        headings = [match.start() for match in _HEADING_RE.finditer(content)]
+        decisions_section = next(
+            (pos for pos in headings if content.startswith("## 12. Decision Log", pos)), 
+            -1
+        )
         
         if decisions_section > 0:
-            # Section exists, check if table needs updating
-            table_start = content.find("|", decisions_section)
-            table_end = content.find("##", table_start)
-            if table_end < 0:  # If it's the last section
-                table_end = len(content)
+            # Section exists, the table runs from its first row to the next heading
+            next_heading = bisect.bisect_right(headings, decisions_section)
+            if next_heading < len(headings):
+                section_end = headings[next_heading]
+            else:  # If it's the last section
+                section_end = len(content)
+            table_start = content.find("|", decisions_section, section_end)
+            if table_start < 0:
+                table_start = section_end
+            table_end = section_end
             
             # Get recent decisions for the context
             recent_decisions = decisions[:5]  # Top 5 most recent
             
             # Create updated table
-            decision_table = "| Date | Decision | Rationale | Alternatives Considered |\n"
-            decision_table += "|------|----------|-----------|------------------------|\n"
+            table_rows = [
+                "| Date | Decision | Rationale | Alternatives Considered |\n",
+                "|------|----------|-----------|------------------------|\n",
+            ]
+            table_rows.extend(
+                f"| {decision['date']} | {decision['decision']} | {decision['rationale']} | See DECISIONS_LOG.md |\n"
+                for decision in recent_decisions
+            )
             
-            for decision in recent_decisions:
-                decision_table += f"| {decision['date']} | {decision['decision']} | {decision['rationale']} | See DECISIONS_LOG.md |\n"
+            # Leave the file untouched when the table is already current
+            decision_table = "".join(table_rows)
+            if content[table_start:table_end] == decision_table:
+                print(f"Decision log in {context_file} is up to date")
+                return True
             
             # Replace the existing table
-            updated_content = content[:table_start] + decision_table
-            
-            if table_end < len(content):
-                updated_content += content[table_end:]
+            updated_content = content[:table_start] + decision_table + content[table_end:]
             
             # Write updated content
             with open(context_file, "w", encoding="utf-8") as f:
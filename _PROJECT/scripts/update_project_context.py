@@ -11,8 +11,43 @@ import json
 import datetime
 import argparse
 import sys
+import shutil
 from pathlib import Path
 
+from atomic_write import write_atomic
+
+# Numbered top-level headings ("## 3. Agent Profile") of the context file
+_SECTION_HEADING_RE = re.compile(r'^## (\d+)\.[ \t]*([^\n]*)', re.MULTILINE)
+
+# Sidecar file in _PROJECT recording the context file state after the last update
+_UPDATE_STATE_FILE = ".ctx_update_state.json"
+
+def _context_state(context_file, today, update_level):
+    """Describe the context file and update run that produced it."""
+    st = os.stat(context_file)
+    return {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "date": today,
+        "level": update_level
+    }
+
+def _load_update_state(state_file):
+    """Load the state recorded by the last update, or None if unavailable."""
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_update_state(state_file, state):
+    """Record the state of the context file after an update."""
+    try:
+        with open(state_file, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+    except OSError as e:
+        print(f"Warning: Could not save update state: {e}")
+
 def update_project_context(update_level="standard", force=False):
     """
     Update the project context file with the latest information.
@@ -35,78 +70,114 @@ def update_project_context(update_level="standard", force=False):
         
     print(f"Updating project context (level: {update_level})")
     
+    # Skip reading the file when it is unchanged since the last update today
+    today = datetime.datetime.now().strftime("%Y-%m-%d")
+    state_file = os.path.join(project_dir, _UPDATE_STATE_FILE)
+    state = _context_state(context_file, today, update_level)
+    if not force and _load_update_state(state_file) == state:
+        print("No changes detected in project context")
+        return True
+    
     # Load the content
     with open(context_file, "r", encoding="utf-8") as f:
         content = f.read()
     
     # First update the last updated date
-    today = datetime.datetime.now().strftime("%Y-%m-%d")
     updated_content = re.sub(
         r'\*\*Last Updated: .+\*\*',
         f'**Last Updated: {today}**',
         content
     )
     
+    # Index the numbered section headings once for all section updates; the
+    # agent profile only rewrites fixed-width dates, so offsets stay valid
+    index = _section_index(updated_content)
+    
     # Update specific sections based on update level
     if update_level == "minimal":
         # Only update Project Focus and Agent Profile
-        updated_content = update_current_focus(updated_content, project_dir)
-        updated_content = update_agent_profile(updated_content)
+        updated_content = update_current_focus(updated_content, project_dir, index)
+        updated_content = update_agent_profile(updated_content, index)
     elif update_level == "standard":
         # Update all main sections
-        updated_content = update_current_focus(updated_content, project_dir)
-        updated_content = update_agent_profile(updated_content)
-        updated_content = update_component_status(updated_content, workspace_root)
-        updated_content = update_known_issues(updated_content, project_dir)
+        updated_content = update_current_focus(updated_content, project_dir, index)
+        updated_content = update_agent_profile(updated_content, index)
+        updated_content = update_component_status(updated_content, workspace_root, index)
+        updated_content = update_known_issues(updated_content, project_dir, index)
     elif update_level == "deep":
         # Deep scan of all project files and reconciliation
-        updated_content = update_current_focus(updated_content, project_dir)
-        updated_content = update_agent_profile(updated_content)
-        updated_content = update_component_status(updated_content, workspace_root)
-        updated_content = update_known_issues(updated_content, project_dir)
-        updated_content = update_code_patterns(updated_content, workspace_root)
+        updated_content = update_current_focus(updated_content, project_dir, index)
+        updated_content = update_agent_profile(updated_content, index)
+        updated_content = update_component_status(updated_content, workspace_root, index)
+        updated_content = update_known_issues(updated_content, project_dir, index)
+        updated_content = update_code_patterns(updated_content, workspace_root, index)
     
     # Check if any changes were made
     if updated_content == content and not force:
         print("No changes detected in project context")
+        _save_update_state(state_file, state)
         return True
     
-    # Write the updated content
-    with open(context_file, "w", encoding="utf-8") as f:
-        f.write(updated_content)
+    # Write the updated content once, atomically
+    write_atomic(context_file, updated_content.encode("utf-8"))
     
-    # Also update the main PROJECT_CONTEXT.md
+    # Also update the main PROJECT_CONTEXT.md from the written file
     main_context_file = os.path.join(project_dir, "PROJECT_CONTEXT.md")
-    with open(main_context_file, "w", encoding="utf-8") as f:
-        f.write(updated_content)
+    shutil.copyfile(context_file, main_context_file)
+    
+    _save_update_state(state_file, _context_state(context_file, today, update_level))
     
     print("Project context updated successfully")
     return True
 
-def update_current_focus(content, project_dir):
-    """Update the current focus section based on recent changes."""
-    focus_start = content.find("## 2. Project Focus")
-    if focus_start < 0:
-        return content
+def _section_index(content):
+    """
+    Index the numbered "## N." headings of the context in a single pass.
     
-    focus_end = content.find("## 3.", focus_start)
-    if focus_end < 0:
+    Returns:
+        dict: {section number: (start offset, heading title)}
+    """
+    index = {}
+    for match in _SECTION_HEADING_RE.finditer(content):
+        index.setdefault(int(match.group(1)), (match.start(), match.group(2)))
+    return index
+
+def _section_bounds(index, number, title):
+    """
+    Look up a numbered section in the heading index.
+    
+    Returns:
+        tuple: (start, end) offsets, ending at the next numbered heading,
+            or None if the section or the following one is missing
+    """
+    start, heading = index.get(number, (-1, ""))
+    end = index.get(number + 1, (-1, ""))[0]
+    if start < 0 or end <= start or not heading.startswith(title):
+        return None
+    return start, end
+
+def update_current_focus(content, project_dir, index=None):
+    """Update the current focus section based on recent changes."""
+    if index is None:
+        index = _section_index(content)
+    bounds = _section_bounds(index, 2, "Project Focus")
+    if bounds is None:
         return content
+    focus_start, focus_end = bounds
     
     # Keep the existing focus content for now - in a more advanced version,
     # we could scan for recent changes in the codebase to update the focus
     
     return content
 
-def update_agent_profile(content):
+def update_agent_profile(content, index=None):
     """Update the agent profile section with recent changes."""
-    agent_start = content.find("## 3. Agent Profile")
-    if agent_start < 0:
-        return content
-    
-    agent_end = content.find("## 4.", agent_start)
-    if agent_end < 0:
+    if index is None:
+        index = _section_index(content)
+    bounds = _section_bounds(index, 3, "Agent Profile")
+    if bounds is None:
         return content
+    agent_start, agent_end = bounds
     
     # Update the session start date to today
     today = datetime.datetime.now().strftime("%Y-%m-%d")
@@ -120,45 +191,42 @@ def update_agent_profile(content):
     updated_content = content[:agent_start] + updated_agent_content + content[agent_end:]
     return updated_content
 
-def update_component_status(content, workspace_root):
+def update_component_status(content, workspace_root, index=None):
     """Update component status based on latest code state."""
-    component_start = content.find("## 7. Implementation Status")
-    if component_start < 0:
-        return content
-    
-    component_end = content.find("## 8.", component_start)
-    if component_end < 0:
+    if index is None:
+        index = _section_index(content)
+    bounds = _section_bounds(index, 7, "Implementation Status")
+    if bounds is None:
         return content
+    component_start, component_end = bounds
     
     # This is where we'd add more sophisticated code scanning
     # For now, just keep the existing content
     
     return content
 
-def update_known_issues(content, project_dir):
+def update_known_issues(content, project_dir, index=None):
     """Update known issues section with latest information."""
-    issues_start = content.find("## 8. Known Issues")
-    if issues_start < 0:
-        return content
-    
-    issues_end = content.find("## 9.", issues_start)
-    if issues_end < 0:
+    if index is None:
+        index = _section_index(content)
+    bounds = _section_bounds(index, 8, "Known Issues")
+    if bounds is None:
         return content
+    issues_start, issues_end = bounds
     
     # This is where we'd scan issue tracking or update based on recent changes
     # For now, just keep the existing content
     
     return content
 
-def update_code_patterns(content, workspace_root):
+def update_code_patterns(content, workspace_root, index=None):
     """Update code patterns section with latest examples from codebase."""
-    patterns_start = content.find("## 9. Code Patterns")
-    if patterns_start < 0:
-        return content
-    
-    patterns_end = content.find("## 10.", patterns_start)
-    if patterns_end < 0:
+    if index is None:
+        index = _section_index(content)
+    bounds = _section_bounds(index, 9, "Code Patterns")
+    if bounds is None:
         return content
+    patterns_start, patterns_end = bounds
     
     # This is where we'd scan the codebase to find updated patterns
     # For now, just keep the existing content
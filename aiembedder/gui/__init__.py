@@ -1,15 +1,35 @@
 """
 GUI package for AIEmbedder.
+
+Widgets are imported on first access so that importing a single GUI module
+does not pull in the processing pipeline behind MainWindow.
 """
 
-from aiembedder.gui.main_window import MainWindow
-from aiembedder.gui.settings_dialog import SettingsDialog
-from aiembedder.gui.progress_panel import ProgressPanel
-from aiembedder.gui.log_panel import LogPanel
+import importlib
+
+_LAZY_IMPORTS = {
+    "MainWindow": "aiembedder.gui.main_window",
+    "SettingsDialog": "aiembedder.gui.settings_dialog",
+    "ProgressPanel": "aiembedder.gui.progress_panel",
+    "LogPanel": "aiembedder.gui.log_panel"
+}
 
 __all__ = [
     "MainWindow",
     "SettingsDialog",
     "ProgressPanel",
     "LogPanel"
-] 
\ No newline at end of file
+]
+
+def __getattr__(name):
+    """Import GUI classes on first access (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    """List the lazily imported GUI classes alongside module globals."""
+    return sorted(set(globals()) | set(__all__))
@@ -3,34 +3,94 @@ Log panel for displaying application logs.
 """
 
 import tkinter as tk
-from tkinter import ttk, scrolledtext
-from typing import Optional, Dict, List, Any, Callable
+from tkinter import ttk
+import tkinter.font as tkfont
+from typing import Dict, List, Any, Deque, Tuple
 import logging
-import queue
+import re
+from logging.handlers import QueueHandler
 import time
+from collections import deque
+from itertools import groupby, islice
+from operator import itemgetter
 
 from aiembedder.utils.logging import Logger
 
-class LogHandler(logging.Handler):
-    """Custom log handler for GUI log panel."""
+# Display tag for each standard log level
+_LEVEL_TAGS = {
+    logging.DEBUG: "debug",
+    logging.INFO: "info",
+    logging.WARNING: "warning",
+    logging.ERROR: "error",
+    logging.CRITICAL: "critical"
+}
+
+# Display tag for each level name, used for already formatted entries
+_LEVEL_NAME_TAGS = {
+    logging.getLevelName(level): tag for level, tag in _LEVEL_TAGS.items()
+}
+
+# First level name in a formatted entry
+_LEVEL_NAME_RE = re.compile(r"\b(DEBUG|INFO|WARNING|ERROR|CRITICAL)\b")
+
+# Most records moved from the queue to the display per Tk tick; a larger
+# backlog is drained over following ticks so the main loop stays responsive
+_DRAIN_LIMIT = 100
+
+# Log queue poll period bounds; the period doubles on each idle tick and drops
+# back to the minimum as soon as records arrive. The maximum is the old fixed
+# period, so idle latency is never worse than before
+_POLL_MIN_MS = 20
+_POLL_MAX_MS = 100
+
+# Text widget options for each display tag
+_TAG_COLORS = {
+    "debug": {"foreground": "gray"},
+    "info": {"foreground": "black"},
+    "warning": {"foreground": "orange"},
+    "error": {"foreground": "red"},
+    "critical": {"foreground": "red", "background": "yellow"},
+    "default": {"foreground": "black"}
+}
+
+class LogHandler(QueueHandler):
+    """Queue handler for GUI log panel.
     
-    def __init__(self, callback: Callable[[str], None]):
+    Records are appended to the panel's deque as-is; formatting is left to the
+    Tk thread so emitting threads only pay for the append. The handler never
+    calls into Tk, since it runs on whichever thread logged, with the handler
+    lock held.
+    """
+    
+    def __init__(self, log_queue: Deque[logging.LogRecord]):
         """Initialize log handler.
         
         Args:
-            callback: Callback function for new log entries
+            log_queue: Deque receiving log records
+        """
+        super().__init__(log_queue)
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return the record unchanged so it is formatted by the consumer.
+        
+        LogPanel.release_record drops the record's arguments and traceback
+        once it has been formatted on the Tk thread.
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            Log record
         """
-        super().__init__()
-        self.callback = callback
+        return record
     
-    def emit(self, record):
-        """Emit a log record.
+    def enqueue(self, record: logging.LogRecord):
+        """Enqueue a log record.
         
         Args:
             record: Log record
         """
-        log_entry = self.format(record)
-        self.callback(log_entry)
+        self.queue.append(record)
 
 class LogPanel:
     """Log panel for displaying application logs."""
@@ -48,15 +108,39 @@ class LogPanel:
         """
         self.parent = parent
         self.logger = logger
-        self.log_queue = queue.Queue()
         self.level_var = tk.StringVar(value="INFO")
         self.should_auto_scroll = tk.BooleanVar(value=True)
         
+        # Python-side copies of the Tk variables so the drain loop does not
+        # make a Tcl round-trip per read
+        self._cached_level_no = logging.INFO
+        self._cached_auto_scroll = True
+        self.should_auto_scroll.trace_add("write", self.on_auto_scroll_change)
+        
+        # Recent raw records, kept so a level change can re-filter history
+        self.records = deque(maxlen=10000)
+        
+        # Retained (tag, text) entries; only the visible window is rendered
+        self.max_lines = 5000
+        self.entries = deque(maxlen=self.max_lines)
+        self.first_row = 0
+        self.visible_rows = 20
+        self._line_height = None
+        self._status_count = None
+        self._update_job = None
+        self._poll_ms = _POLL_MIN_MS
+        
+        # Only the Tk thread pops, so deque's atomic append/popleft is enough.
+        # The bound matches the display: a burst larger than max_lines would
+        # push its oldest entries out of the view anyway, so dropping the
+        # oldest queued records on overflow is intended
+        self.log_queue = deque(maxlen=self.max_lines)
+        
         self.create_widgets()
         self.setup_layout()
         self.setup_handler()
         
-        # Start periodic log update
+        # Show anything logged while the panel was being set up
         self.update_logs()
     
     def create_widgets(self):
@@ -85,15 +169,37 @@ class LogPanel:
         self.clear_button = ttk.Button(self.options_frame, text="Clear Logs", command=self.clear_logs)
         
         # Log display
-        self.log_text = scrolledtext.ScrolledText(
-            self.main_frame,
-            wrap=tk.WORD,
+        self.log_view_frame = ttk.Frame(self.main_frame)
+        self.log_text = tk.Text(
+            self.log_view_frame,
+            wrap=tk.NONE,
             width=80,
-            height=20,
+            height=self.visible_rows,
             background="#f5f5f5",
             font=("Courier", 9)
         )
         self.log_text.config(state=tk.DISABLED)
+        for tag, options in _TAG_COLORS.items():
+            self.log_text.tag_configure(tag, **options)
+        self.log_text.bind("<Configure>", self.on_view_resize)
+        self.log_text.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.log_text.bind("<Button-4>", self.on_mouse_wheel)
+        self.log_text.bind("<Button-5>", self.on_mouse_wheel)
+        
+        # The scrollbar tracks the entry model, not the widget contents
+        self.log_scrollbar = ttk.Scrollbar(
+            self.log_view_frame,
+            orient=tk.VERTICAL,
+            command=self.on_scroll
+        )
+        
+        # Long lines scroll horizontally rather than being re-wrapped
+        self.log_hscrollbar = ttk.Scrollbar(
+            self.log_view_frame,
+            orient=tk.HORIZONTAL,
+            command=self.log_text.xview
+        )
+        self.log_text.config(xscrollcommand=self.log_hscrollbar.set)
         
         # Status bar
         self.status_bar = ttk.Label(self.main_frame, text="0 log entries")
@@ -117,16 +223,22 @@ class LogPanel:
         self.clear_button.pack(side=tk.RIGHT)
         
         # Log display
-        self.log_text.pack(fill=tk.BOTH, expand=True, pady=(0, 5))
+        self.log_view_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 5))
+        self.log_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.log_hscrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Status bar
         self.status_bar.pack(side=tk.LEFT)
     
     def setup_handler(self):
         """Set up log handler."""
-        # Create custom log handler
-        self.handler = LogHandler(self.on_log_entry)
-        self.handler.setLevel(logging.DEBUG)
+        # Create queue handler feeding the log deque
+        self.handler = LogHandler(self.log_queue)
+        
+        # Match the panel level so the logging module skips lower records
+        # before they are queued
+        self.handler.setLevel(self._cached_level_no)
         
         # Format log entries
         formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
@@ -136,27 +248,90 @@ class LogPanel:
         root_logger = logging.getLogger()
         root_logger.addHandler(self.handler)
     
-    def on_log_entry(self, log_entry: str):
-        """Handle new log entry.
+    def destroy(self):
+        """Detach the log handler and destroy the panel widgets."""
+        logging.getLogger().removeHandler(self.handler)
+        self.handler.close()
         
-        Args:
-            log_entry: Log entry text
-        """
-        # Add log entry to queue
-        self.log_queue.put(log_entry)
+        # Cancel a pending drain
+        if self._update_job is not None:
+            self.parent.after_cancel(self._update_job)
+            self._update_job = None
+        
+        self.main_frame.destroy()
     
     def update_logs(self):
-        """Update log display from queue."""
-        # Process all available log entries
-        while not self.log_queue.empty():
+        """Update log display from queue.
+        
+        Polls itself on the Tk thread, backing off while the queue is empty.
+        """
+        self._update_job = None
+        
+        # Drain up to _DRAIN_LIMIT queued records into one batch, dropping
+        # records below the selected level with a single int compare before
+        # any tag lookup or formatting
+        level_no = self._cached_level_no
+        records = self.records
+        batch = []
+        records_drained = False
+        for _ in range(_DRAIN_LIMIT):
             try:
-                log_entry = self.log_queue.get_nowait()
-                self.add_log_entry(log_entry)
-            except queue.Empty:
+                record = self.log_queue.popleft()
+            except IndexError:
                 break
+            records_drained = True
+            records.append(record)
+            if record.levelno >= level_no:
+                batch.append(record)
+            else:
+                self.release_record(record)
+        
+        if batch:
+            self.add_log_entries(self.format_records(batch))
         
-        # Schedule next update
-        self.parent.after(100, self.update_logs)
+        # Schedule the next drain; the rest of a burst is left to it
+        if records_drained:
+            self._poll_ms = _POLL_MIN_MS
+        else:
+            self._poll_ms = min(self._poll_ms * 2, _POLL_MAX_MS)
+        self._update_job = self.parent.after(self._poll_ms, self.update_logs)
+    
+    def format_records(self, records: List[logging.LogRecord]) -> List[Tuple[str, str]]:
+        """Format log records for display.
+        
+        Runs on the Tk thread rather than in the emitting thread.
+        
+        Args:
+            records: Log records
+            
+        Returns:
+            (tag, log entry text) pairs
+        """
+        log_format = self.handler.format
+        release = self.release_record
+        entries = []
+        for record in records:
+            entries.append((_LEVEL_TAGS.get(record.levelno, "default"), log_format(record)))
+            release(record)
+        return entries
+    
+    def release_record(self, record: logging.LogRecord):
+        """Drop a record's references to its arguments and traceback.
+        
+        This is what QueueHandler.prepare would do on the emitting thread:
+        the message is merged and the traceback kept as text, so a retained
+        record no longer holds frames or the objects they reference, and
+        formatting it again gives the same entry.
+        
+        Args:
+            record: Log record
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.handler.formatter.formatException(record.exc_info)
+            record.exc_info = None
     
     def add_log_entry(self, log_entry: str):
         """Add log entry to display.
@@ -164,25 +339,131 @@ class LogPanel:
         Args:
             log_entry: Log entry text
         """
-        # Check if entry matches current filter
-        current_level = self.level_var.get()
-        if current_level in log_entry:
-            # Enable text widget
-            self.log_text.config(state=tk.NORMAL)
-            
-            # Add entry with appropriate tag
-            tag = self.get_tag_for_entry(log_entry)
-            self.log_text.insert(tk.END, log_entry + "\n", tag)
+        self.add_log_entries([(self.get_tag_for_entry(log_entry), log_entry)])
+    
+    def add_log_entries(self, entries: List[Tuple[str, str]]):
+        """Add a batch of log entries to display.
+        
+        Entries are appended to the model; the view is only re-rendered when
+        the visible window is affected.
+        
+        Args:
+            entries: (tag, log entry text) pairs
+        """
+        if entries:
+            total = len(self.entries)
+            evicted = max(0, total + len(entries) - self.max_lines)
+            self.entries.extend(entries)
             
-            # Auto-scroll if enabled
-            if self.should_auto_scroll.get():
-                self.log_text.see(tk.END)
+            if self._cached_auto_scroll:
+                # Follow the newest entries
+                self.first_row = max(0, len(self.entries) - self.visible_rows)
+                self.render_view()
+            elif evicted or total < self.first_row + self.visible_rows:
+                # Keep the same entries in view after eviction
+                self.first_row = max(0, self.first_row - evicted)
+                self.render_view()
+            else:
+                self.update_scrollbar()
             
-            # Disable text widget
-            self.log_text.config(state=tk.DISABLED)
+            # Update status bar
+            self.update_status()
+    
+    def render_view(self):
+        """Render the visible window of entries into the text widget."""
+        window = islice(self.entries, self.first_row, self.first_row + self.visible_rows)
         
-        # Update status bar
-        self.update_status()
+        # One "chars tag" pair per run of consecutive entries sharing a tag,
+        # so the whole window goes to Tk in a single insert call
+        chunks = []
+        for tag, run in groupby(window, key=itemgetter(0)):
+            chunks.append("\n".join(map(itemgetter(1), run)) + "\n")
+            chunks.append(tag)
+        
+        log_text = self.log_text
+        end = tk.END
+        
+        # Enable text widget
+        log_text.config(state=tk.NORMAL)
+        log_text.delete("1.0", end)
+        
+        if chunks:
+            log_text.insert(end, *chunks)
+        
+        # Keep the newest line visible if multi-line entries overflow the view
+        if self._cached_auto_scroll:
+            log_text.see(end)
+        
+        # Disable text widget
+        log_text.config(state=tk.DISABLED)
+        
+        self.update_scrollbar()
+    
+    def update_scrollbar(self):
+        """Update scrollbar position from the visible window."""
+        total = len(self.entries)
+        if total <= self.visible_rows:
+            self.log_scrollbar.set(0.0, 1.0)
+        else:
+            self.log_scrollbar.set(
+                self.first_row / total,
+                min(1.0, (self.first_row + self.visible_rows) / total)
+            )
+    
+    def scroll_to(self, first_row: int):
+        """Scroll the view so that the given entry is the first visible row.
+        
+        Args:
+            first_row: Index of the first visible entry
+        """
+        first_row = max(0, min(first_row, len(self.entries) - self.visible_rows))
+        if first_row != self.first_row:
+            self.first_row = first_row
+            self.render_view()
+    
+    def on_scroll(self, *args):
+        """Handle scrollbar commands.
+        
+        Args:
+            args: Scrollbar command arguments ("moveto", fraction) or
+                ("scroll", number, "units"/"pages")
+        """
+        if args[0] == tk.MOVETO:
+            self.scroll_to(int(float(args[1]) * len(self.entries)))
+        elif args[0] == tk.SCROLL:
+            step = int(args[1])
+            if args[2] == tk.PAGES:
+                step *= self.visible_rows
+            self.scroll_to(self.first_row + step)
+    
+    def on_mouse_wheel(self, event):
+        """Handle mouse wheel scrolling over the log view.
+        
+        Args:
+            event: Mouse wheel event
+        """
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.first_row - 3)
+        else:
+            self.scroll_to(self.first_row + 3)
+        return "break"
+    
+    def on_view_resize(self, event):
+        """Recompute the number of visible rows when the view is resized.
+        
+        Args:
+            event: Configure event
+        """
+        if self._line_height is None:
+            font = tkfont.Font(root=self.log_text, font=self.log_text.cget("font"))
+            self._line_height = max(1, font.metrics("linespace"))
+        
+        visible_rows = max(1, event.height // self._line_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            if self._cached_auto_scroll:
+                self.first_row = max(0, len(self.entries) - visible_rows)
+            self.render_view()
     
     def get_tag_for_entry(self, log_entry: str) -> str:
         """Get the appropriate tag for a log entry.
@@ -193,18 +474,8 @@ class LogPanel:
         Returns:
             Tag name
         """
-        if "DEBUG" in log_entry:
-            return "debug"
-        elif "INFO" in log_entry:
-            return "info"
-        elif "WARNING" in log_entry:
-            return "warning"
-        elif "ERROR" in log_entry:
-            return "error"
-        elif "CRITICAL" in log_entry:
-            return "critical"
-        else:
-            return "default"
+        match = _LEVEL_NAME_RE.search(log_entry)
+        return _LEVEL_NAME_TAGS[match.group(1)] if match else "default"
     
     def on_level_change(self, event):
         """Handle log level change.
@@ -212,31 +483,53 @@ class LogPanel:
         Args:
             event: Combobox event
         """
-        self.clear_logs()
+        level_no = getattr(logging, self.level_var.get())
+        self._cached_level_no = level_no
+        self.handler.setLevel(level_no)
+        
+        # Rebuild the view from the newest retained records at the new level;
+        # records below the previous level were never queued
+        recent = list(islice(
+            (record for record in reversed(self.records) if record.levelno >= level_no),
+            self.max_lines
+        ))
+        recent.reverse()
+        
+        self.entries.clear()
+        self.entries.extend(self.format_records(recent))
+        self.first_row = max(0, len(self.entries) - self.visible_rows)
+        self.render_view()
+        
+        # Update status bar
+        self.update_status()
+    
+    def on_auto_scroll_change(self, *args):
+        """Handle auto-scroll option change.
+        
+        Args:
+            args: Variable trace arguments
+        """
+        self._cached_auto_scroll = self.should_auto_scroll.get()
     
     def clear_logs(self):
         """Clear log display."""
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.delete(1.0, tk.END)
-        self.log_text.config(state=tk.DISABLED)
+        self.records.clear()
+        
+        # Nothing to redraw, and no state toggle needed, if already empty
+        if self.entries:
+            self.entries.clear()
+            self.first_row = 0
+            self.render_view()
         
         # Update status bar
         self.update_status()
     
     def update_status(self):
         """Update status bar."""
-        # Count log entries
-        log_content = self.log_text.get(1.0, tk.END)
-        entry_count = log_content.count("\n") - 1  # Subtract empty line at end
+        entry_count = len(self.entries)
         
-        # Update status text
+        # Skip the Tk call when the count has not changed, e.g. at the cap
+        if entry_count == self._status_count:
+            return
+        self._status_count = entry_count
         self.status_bar.config(text=f"{entry_count} log {'entry' if entry_count == 1 else 'entries'}")
-    
-    def set_colors(self):
-        """Set colors for log levels."""
-        self.log_text.tag_configure("debug", foreground="gray")
-        self.log_text.tag_configure("info", foreground="black")
-        self.log_text.tag_configure("warning", foreground="orange")
-        self.log_text.tag_configure("error", foreground="red")
-        self.log_text.tag_configure("critical", foreground="red", background="yellow")
-        self.log_text.tag_configure("default", foreground="black") 
\ No newline at end of file
@@ -4,12 +4,17 @@ Main window for AIEmbedder GUI.
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import json
+import logging
 import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Callable
-import threading
-import queue
-import re
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Callable, Tuple, Iterator
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from itertools import islice
+import time
+import traceback
 from datetime import datetime
 
 from aiembedder.utils.config import Config
@@ -19,11 +24,139 @@ from aiembedder.utils.errors import AIEmbedderError, ProcessingError
 from aiembedder.gui.settings_dialog import SettingsDialog
 from aiembedder.gui.progress_panel import ProgressPanel
 from aiembedder.gui.log_panel import LogPanel
-from aiembedder.processing.pipeline import TextProcessingPipeline
-from aiembedder.vector.generator import VectorGenerator
-from aiembedder.vector.database import VectorDatabase
 from aiembedder.processors.processor_factory import ProcessorFactory
 
+# The pipeline and vector modules pull in torch, sentence-transformers and
+# chromadb; they are imported where first used so the window opens quickly
+if TYPE_CHECKING:
+    from aiembedder.processing.pipeline import TextProcessingPipeline
+    from aiembedder.vector.generator import VectorGenerator
+    from aiembedder.vector.database import VectorDatabase
+
+# File extensions collected when processing a directory
+_DIRECTORY_EXTENSIONS = frozenset({".txt", ".html", ".htm", ".pdf", ".doc", ".docx"})
+
+# Characters not allowed in Windows file names, mapped to "_"
+_UNSAFE_FS_TRANS = str.maketrans({c: "_" for c in '\\/*?:"<>|'})
+
+# Number of chunks accumulated across files before one embedding call
+_EMBED_BATCH_CHUNKS = 4096
+
+# Default number of extraction threads (processing.num_workers), and how
+# many files per thread may be extracted ahead of embedding
+_EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+_EXTRACT_AHEAD = 2
+
+# File name suffix of a document's chunks saved as one JSONL file
+_AGGREGATED_CHUNKS_SUFFIX = ".chunks.jsonl"
+
+# Threads writing the chunk files of one document concurrently
+_WRITE_WORKERS = min(8, os.cpu_count() or 1)
+
+# Maximum processing-queue messages handled per Tk tick
+_QUEUE_DRAIN_LIMIT = 32
+
+# Queue poll period bounds; the period doubles on each idle tick and drops
+# back to the minimum as soon as there is work
+_QUEUE_POLL_MIN_MS = 10
+_QUEUE_POLL_MAX_MS = 100
+
+# Minimum seconds between per-file progress updates from the worker
+_PROGRESS_INTERVAL = 0.05
+
+def _write_chunk_file(path: Path, text: str):
+    """Write one chunk file.
+    
+    Args:
+        path: Chunk file path
+        text: File contents
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def _iter_directory_files(dir_path: Path) -> Iterator[Path]:
+    """Yield the files under a directory with a supported extension.
+    
+    Uses os.scandir, whose entries answer is_file/is_dir from the directory
+    listing on most platforms instead of a stat call per entry. Like os.walk,
+    symlinked directories are not descended into and unreadable directories
+    are skipped; broken symlinks are not yielded.
+    
+    Args:
+        dir_path: Directory path
+        
+    Yields:
+        File paths
+    """
+    stack = [os.fspath(dir_path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif (os.path.splitext(entry.name)[1].lower() in _DIRECTORY_EXTENSIONS
+                              and entry.is_file()):
+                            yield Path(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+@dataclass(frozen=True)
+class ProcSettings:
+    """Processing settings snapshot taken once per run."""
+    cleaning_level: str
+    chunk_size: int
+    chunk_overlap: int
+    similarity_threshold: float
+    use_gpu: bool
+    optimize_for_gpt4all: bool
+    chunks_dir: Path
+    aggregated_chunks: bool
+    num_workers: int
+    collection_name: str
+    persist_directory: str
+    embedding_model: str
+
+class _QueuedProgress:
+    """Progress tracker stand-in for the worker threads.
+    
+    Every call is posted to the processing queue and applied to the real
+    tracker by process_queue, so tracker callbacks, which update Tk widgets,
+    only ever run on the Tk thread.
+    """
+    
+    def __init__(self, processing_queue: deque):
+        """Initialize queued progress.
+        
+        Args:
+            processing_queue: Queue drained by MainWindow.process_queue
+        """
+        self.processing_queue = processing_queue
+    
+    def start_task(self, task_id: str, total: int, status: str = "Starting...") -> str:
+        """Post a task start; see ProgressTracker.start_task."""
+        self.processing_queue.append(("progress", ("start_task", (task_id, total, status))))
+        return task_id
+    
+    def update_task(self, task_id: str, current: int = None, status: str = None) -> None:
+        """Post a task update; see ProgressTracker.update_task."""
+        self.processing_queue.append(("progress", ("update_task", (task_id, current, status))))
+    
+    def set_total(self, task_id: str, total: int) -> None:
+        """Post a task total; see ProgressTracker.set_total."""
+        self.processing_queue.append(("progress", ("set_total", (task_id, total))))
+    
+    def complete_task(self, task_id: str, status: str = "Complete") -> None:
+        """Post a task completion; see ProgressTracker.complete_task."""
+        self.processing_queue.append(("progress", ("complete_task", (task_id, status))))
+    
+    def add_error(self, task_id: str, error: str) -> None:
+        """Post a task error; see ProgressTracker.add_error."""
+        self.processing_queue.append(("progress", ("add_error", (task_id, error))))
+
 class MainWindow:
     """Main window for AIEmbedder GUI."""
     
@@ -53,9 +186,38 @@ class MainWindow:
         self.processor_factory = ProcessorFactory(logger=self.logger)
         
         # Initialize event handling
-        self.processing_thread = None
-        self.stop_processing_flag = threading.Event()
-        self.processing_queue = queue.Queue()
+        # Single worker reused by every run; its thread is started on the
+        # first submit and kept until exit
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aiembedder-main")
+        # Chunk file writes of a document are spread over these threads
+        self._write_pool = ThreadPoolExecutor(max_workers=_WRITE_WORKERS, thread_name_prefix="aiembedder-write")
+        self._current_future: Optional[Future] = None
+        # Plain attribute: set by the Tk thread, polled by the worker loops
+        self._stop_requested = False
+        # Unbounded channel from the worker threads to the Tk thread; deque
+        # append and popleft are atomic, and the consumer is the polling
+        # process_queue, so no lock or wake-up signal is needed
+        self.processing_queue = deque()
+        self._poll_ms = _QUEUE_POLL_MIN_MS
+        # Tracker used by the worker threads; its calls are applied to
+        # progress_tracker on the Tk thread
+        self._worker_progress = _QueuedProgress(self.processing_queue)
+        
+        # Latest (current, status) per task, written by the worker and applied
+        # to the progress tracker once per queue tick
+        self._task_state = {}
+        
+        # Python-side mirror of the file listbox for O(1) membership checks
+        self._file_set = set()
+        self._file_order = []
+        
+        # Vector generator and database reused across processing runs, each
+        # keyed by the settings it was built with and holding only the latest
+        self._generator_cache = {}
+        self._db_cache = {}
+        
+        # Resolved chunks directory, see _get_chunks_dir
+        self._chunks_dir = None
         
         self.setup_styles()
         self.create_menu()
@@ -137,7 +299,14 @@ class MainWindow:
         
         # File listbox
         self.file_list_frame = ttk.Frame(self.file_frame)
-        self.file_listbox = tk.Listbox(self.file_list_frame, selectmode=tk.EXTENDED, height=5)
+        # The listbox only displays _file_order through its list variable
+        self.file_list_var = tk.Variable(value=())
+        self.file_listbox = tk.Listbox(
+            self.file_list_frame,
+            listvariable=self.file_list_var,
+            selectmode=tk.EXTENDED,
+            height=5
+        )
         self.file_scrollbar = ttk.Scrollbar(self.file_list_frame, command=self.file_listbox.yview)
         self.file_listbox.config(yscrollcommand=self.file_scrollbar.set)
         
@@ -181,6 +350,7 @@ class MainWindow:
         self.action_frame = ttk.Frame(self.main_frame)
         self.process_button = ttk.Button(self.action_frame, text="Process Files", command=self.process_files)
         self.process_button.configure(state="disabled")  # Disabled until files are selected
+        self._process_enabled = False
         self.stop_button = ttk.Button(self.action_frame, text="Stop", command=self.stop_processing)
         self.stop_button.configure(state="disabled")  # Disabled until processing starts
         
@@ -256,9 +426,18 @@ class MainWindow:
         if messagebox.askokcancel("Exit", "Are you sure you want to exit?"):
             self.logger.info("Exiting application")
             # Stop any running threads
-            self.stop_processing_flag.set()
-            if self.processing_thread and self.processing_thread.is_alive():
-                self.processing_thread.join(timeout=2.0)
+            self._stop_requested = True
+            if self._is_processing():
+                wait([self._current_future], timeout=2.0)
+            # Drop a run that has not started yet; shutdown(cancel_futures=)
+            # needs Python 3.9
+            if self._current_future is not None:
+                self._current_future.cancel()
+            self._executor.shutdown(wait=False)
+            # Let queued chunk file writes finish so no document is left with
+            # a partly written chunk folder
+            self._write_pool.shutdown(wait=True)
+            self.log_panel.destroy()
             self.root.destroy()
     
     def open_file(self):
@@ -277,9 +456,10 @@ class MainWindow:
         )
         
         if filenames:
-            for filename in filenames:
-                if filename not in self.file_listbox.get(0, tk.END):
-                    self.file_listbox.insert(tk.END, filename)
+            added = [filename for filename in filenames if self._add_path(filename)]
+            if added:
+                self._append_to_file_list(added)
+                for filename in added:
                     self.logger.info(f"Added file: {filename}")
             
             self.update_buttons()
@@ -291,31 +471,75 @@ class MainWindow:
         )
         
         if directory:
-            if directory not in self.file_listbox.get(0, tk.END):
-                self.file_listbox.insert(tk.END, directory)
+            if self._add_path(directory):
+                self._append_to_file_list([directory])
                 self.logger.info(f"Added directory: {directory}")
             
             self.update_buttons()
     
+    def _add_path(self, path: str) -> bool:
+        """Add a path to the file list unless it is already listed.
+        
+        Call _append_to_file_list afterwards to update the listbox.
+        
+        Args:
+            path: File or directory path
+            
+        Returns:
+            True if the path was added
+        """
+        if path in self._file_set:
+            return False
+        self._file_set.add(path)
+        self._file_order.append(path)
+        return True
+    
+    def _append_to_file_list(self, paths: List[str]):
+        """Append newly added paths to the listbox in a single Tk call.
+        
+        The listbox keeps its list variable in sync, so only the new entries
+        cross into Tcl rather than the whole list.
+        
+        Args:
+            paths: Paths already added with _add_path
+        """
+        self.file_listbox.insert(tk.END, *paths)
+    
+    def _refresh_file_list(self):
+        """Push the file list to the listbox in a single Tk call."""
+        self.file_list_var.set(tuple(self._file_order))
+    
     def remove_selected(self):
         """Remove selected files."""
         selected = self.file_listbox.curselection()
-        for i in reversed(selected):
-            self.file_listbox.delete(i)
+        if selected:
+            for i in reversed(selected):
+                self._file_set.discard(self._file_order.pop(i))
+            self._refresh_file_list()
         
         self.update_buttons()
     
     def clear_files(self):
         """Clear all files."""
-        self.file_listbox.delete(0, tk.END)
+        self._file_set.clear()
+        self._file_order.clear()
+        self._refresh_file_list()
         self.update_buttons()
     
     def update_buttons(self):
         """Update button states."""
-        if self.file_listbox.size() > 0:
-            self.process_button.configure(state="normal")
-        else:
-            self.process_button.configure(state="disabled")
+        self._set_process_enabled(bool(self._file_order))
+    
+    def _set_process_enabled(self, enabled: bool):
+        """Enable or disable the process button, skipping no-op changes.
+        
+        Args:
+            enabled: Whether the button should be enabled
+        """
+        if enabled == self._process_enabled:
+            return
+        self._process_enabled = enabled
+        self.process_button.configure(state="normal" if enabled else "disabled")
     
     def open_settings(self):
         """Open settings dialog."""
@@ -328,14 +552,13 @@ class MainWindow:
             self.overlap_var.set(self.config.get("processing", "chunk_overlap", 50))
             self.similarity_var.set(self.config.get("processing", "dedup_threshold", 0.95))
             
-            # Ensure chunks directory exists
-            chunks_dir = Path(self.config.get("processing", "chunks_directory", "~/.aiembedder/chunks")).expanduser()
-            if not chunks_dir.exists():
-                try:
-                    chunks_dir.mkdir(parents=True, exist_ok=True)
-                    self.logger.info(f"Created chunks directory: {chunks_dir}")
-                except Exception as e:
-                    self.logger.error(f"Error creating chunks directory: {str(e)}")
+            # Resolve the possibly changed chunks directory again and
+            # ensure it exists
+            self._chunks_dir = None
+            try:
+                self._get_chunks_dir()
+            except Exception as e:
+                self.logger.error(f"Error creating chunks directory: {str(e)}")
     
     def open_search(self):
         """Open search dialog."""
@@ -345,27 +568,52 @@ class MainWindow:
     def reset_database(self):
         """Reset the vector database."""
         if messagebox.askyesno("Reset Database", "Are you sure you want to reset the database? This will delete all stored embeddings."):
-            try:
-                # Create database with configured settings
-                collection_name = self.config.get("database", "collection_name", "aiembedder")
-                persist_directory = self.config.get("database", "persist_directory", "~/.aiembedder/db")
-                use_gpu = self.config.get("processing", "use_gpu", True)
-                
-                db = VectorDatabase(
-                    collection_name=collection_name,
-                    persist_directory=persist_directory,
-                    use_gpu=use_gpu,
-                    logger=self.logger
-                )
-                
-                # Reset collection
-                db.reset_collection()
-                
-                messagebox.showinfo("Success", "Database has been reset successfully.")
-                
-            except Exception as e:
-                self.logger.error(f"Error resetting database: {str(e)}")
-                messagebox.showerror("Error", f"Failed to reset database: {str(e)}")
+            # Read the settings here; the reset itself runs on the worker
+            # thread, after any processing run in progress
+            collection_name = self.config.get("database", "collection_name", "aiembedder")
+            persist_directory = self.config.get("database", "persist_directory", "~/.aiembedder/db")
+            use_gpu = self.config.get("processing", "use_gpu", True)
+            
+            self.database_menu.entryconfigure("Reset Database", state="disabled")
+            self._executor.submit(
+                self._reset_database_thread, collection_name, persist_directory, use_gpu
+            )
+    
+    def _reset_database_thread(self, collection_name: str, persist_directory: str, use_gpu: bool):
+        """Reset the vector database in a separate thread.
+        
+        Args:
+            collection_name: Collection name
+            persist_directory: Database directory
+            use_gpu: Whether to use GPU
+        """
+        try:
+            from aiembedder.vector.database import VectorDatabase
+            
+            # Create database with configured settings
+            db = VectorDatabase(
+                collection_name=collection_name,
+                persist_directory=persist_directory,
+                use_gpu=use_gpu,
+                logger=self.logger
+            )
+            
+            # Reset collection
+            db.reset_collection()
+            self._db_cache.clear()
+            
+            self.processing_queue.append(("info_dialog", ("Success", "Database has been reset successfully.")))
+            
+        except Exception as e:
+            self.logger.error(f"Error resetting database: {str(e)}")
+            self.processing_queue.append(("error_dialog", ("Error", f"Failed to reset database: {str(e)}")))
+        
+        finally:
+            self.processing_queue.append(("reset_done", None))
+    
+    def _on_reset_done(self):
+        """Re-enable the reset menu entry once the reset has finished."""
+        self.database_menu.entryconfigure("Reset Database", state="normal")
     
     def show_about(self):
         """Show about dialog."""
@@ -393,75 +641,84 @@ class MainWindow:
         """Process selected files."""
         try:
             # Validate inputs
-            file_paths = list(self.file_listbox.get(0, tk.END))
+            file_paths = list(self._file_order)
             if not file_paths:
                 messagebox.showwarning("No Files", "Please select files or directories to process.")
                 return
             
+            # Read each setting from Tk once
+            settings = {
+                "cleaning_level": self.cleaning_var.get(),
+                "chunk_size": self.chunk_var.get(),
+                "chunk_overlap": self.overlap_var.get(),
+                "dedup_threshold": self.similarity_var.get()
+            }
+            
             # Check if chunk overlap is less than chunk size
-            chunk_size = self.chunk_var.get()
-            chunk_overlap = self.overlap_var.get()
-            if chunk_overlap >= chunk_size:
+            if settings["chunk_overlap"] >= settings["chunk_size"]:
                 messagebox.showerror("Invalid Settings", "Chunk overlap must be less than chunk size.")
                 return
             
-            # Create chunks directory if it doesn't exist
-            # Get chunks directory directly from config dictionary
-            if "processing" in self.config.config and "chunks_directory" in self.config.config["processing"]:
-                chunks_dir_path = self.config.config["processing"]["chunks_directory"]
-            else:
-                chunks_dir_path = "~/.aiembedder/chunks"  # Use default only if not found
-                # Set it in config
-                self.config.set("processing", "chunks_directory", chunks_dir_path)
-                self.logger.info(f"Set chunks_directory in config: {chunks_dir_path}")
-
-            chunks_dir = Path(chunks_dir_path).expanduser()
-            self.logger.info(f"Using chunks directory from config: {chunks_dir}")
+            # Hand-edited config files may hold anything here
+            try:
+                num_workers = max(1, int(self.config.get("processing", "num_workers", _EXTRACT_WORKERS)))
+            except (TypeError, ValueError):
+                messagebox.showerror("Invalid Settings", "The number of extraction workers must be a whole number.")
+                return
             
-            if not chunks_dir.exists():
-                try:
-                    chunks_dir.mkdir(parents=True, exist_ok=True)
-                    self.logger.info(f"Created chunks directory: {chunks_dir}")
-                except Exception as e:
-                    self.logger.error(f"Error creating chunks directory: {str(e)}")
-                    messagebox.showerror("Directory Error", f"Failed to create chunks directory: {str(e)}")
-                    return
+            # Create chunks directory if it doesn't exist
+            try:
+                chunks_dir = self._get_chunks_dir()
+            except Exception as e:
+                self.logger.error(f"Error creating chunks directory: {str(e)}")
+                messagebox.showerror("Directory Error", f"Failed to create chunks directory: {str(e)}")
+                return
             
-            # Update processing configuration
+            # Update processing configuration, keeping the other keys of the
+            # section such as chunks_directory and use_gpu
             self.config.update({
-                "processing": {
-                    "cleaning_level": self.cleaning_var.get(),
-                    "chunk_size": chunk_size,
-                    "chunk_overlap": chunk_overlap,
-                    "dedup_threshold": self.similarity_var.get()
-                }
+                "processing": {**self.config.config.get("processing", {}), **settings}
             })
             
+            # Snapshot everything the run needs so the worker never reads the
+            # config
+            proc_settings = ProcSettings(
+                cleaning_level=settings["cleaning_level"],
+                chunk_size=settings["chunk_size"],
+                chunk_overlap=settings["chunk_overlap"],
+                similarity_threshold=settings["dedup_threshold"],
+                use_gpu=self.config.get("processing", "use_gpu", True),
+                optimize_for_gpt4all=self.config.get("processing", "optimize_for_gpt4all", True),
+                chunks_dir=chunks_dir,
+                aggregated_chunks=self.config.get("processing", "aggregated_chunks", False),
+                num_workers=num_workers,
+                collection_name=self.config.get("database", "collection_name", "aiembedder"),
+                persist_directory=self.config.get("database", "persist_directory", "~/.aiembedder/db"),
+                embedding_model=self.config.get("database", "embedding_model", "all-MiniLM-L6-v2")
+            )
+            
             # Update UI state
-            self.process_button.configure(state="disabled")
+            self._set_process_enabled(False)
             self.stop_button.configure(state="normal")
             self.notebook.select(0)  # Switch to Progress tab
             
             # Reset stop flag
-            self.stop_processing_flag.clear()
+            self._stop_requested = False
             
             # Log start of processing
             self.logger.info(f"Starting processing of {len(file_paths)} files/directories")
             
-            # Start processing in a separate thread
-            self.processing_thread = threading.Thread(
-                target=self._process_files_thread,
-                args=(file_paths,),
-                daemon=True
+            # Start processing on the worker thread
+            self._current_future = self._executor.submit(
+                self._process_files_thread, file_paths, proc_settings
             )
-            self.processing_thread.start()
             
         except AIEmbedderError as e:
             self.logger.error(f"Processing error: {str(e)}")
             messagebox.showerror("Processing Error", str(e))
             
             # Update UI state
-            self.process_button.configure(state="normal")
+            self._set_process_enabled(True)
             self.stop_button.configure(state="disabled")
             
         except Exception as e:
@@ -469,145 +726,277 @@ class MainWindow:
             messagebox.showerror("Unexpected Error", f"An unexpected error occurred: {str(e)}")
             
             # Update UI state
-            self.process_button.configure(state="normal")
+            self._set_process_enabled(True)
             self.stop_button.configure(state="disabled")
     
-    def _process_files_thread(self, file_paths: List[str]):
+    def _process_files_thread(self, file_paths: List[str], settings: ProcSettings):
         """Process files in a separate thread.
         
         Args:
             file_paths: List of file paths to process
+            settings: Processing settings validated by process_files
         """
         try:
+            from aiembedder.processing.pipeline import TextProcessingPipeline
+            
             # Create main task
-            main_task_id = self.progress_tracker.start_task(
+            main_task_id = self._worker_progress.start_task(
                 "main_processing",
                 total=len(file_paths),
                 status="Processing files"
             )
             
-            # Get processing settings
-            cleaning_level = self.config.get("processing", "cleaning_level", "medium")
-            chunk_size = self.config.get("processing", "chunk_size", 400)
-            chunk_overlap = self.config.get("processing", "chunk_overlap", 50)
-            similarity_threshold = self.config.get("processing", "dedup_threshold", 0.95)
-            use_gpu = self.config.get("processing", "use_gpu", True)
-            optimize_for_gpt4all = self.config.get("processing", "optimize_for_gpt4all", True)
-            
             # Create processing components
             pipeline = TextProcessingPipeline(
-                cleaning_level=cleaning_level,
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                similarity_threshold=similarity_threshold,
-                use_gpu=use_gpu,
-                optimize_for_gpt4all=optimize_for_gpt4all,
-                progress_tracker=self.progress_tracker
+                cleaning_level=settings.cleaning_level,
+                chunk_size=settings.chunk_size,
+                chunk_overlap=settings.chunk_overlap,
+                similarity_threshold=settings.similarity_threshold,
+                use_gpu=settings.use_gpu,
+                optimize_for_gpt4all=settings.optimize_for_gpt4all,
+                progress_tracker=self._worker_progress
             )
             
-            # Create vector components
-            model_name = self.config.get("database", "embedding_model", "all-MiniLM-L6-v2")
-            generator = VectorGenerator(
-                model_name=model_name,
-                use_gpu=use_gpu,
-                logger=self.logger
-            )
+            # Reuse vector components from earlier runs with the same settings
+            generator, db = self._get_vector_components(settings)
             
-            collection_name = self.config.get("database", "collection_name", "aiembedder")
-            persist_directory = self.config.get("database", "persist_directory", "~/.aiembedder/db")
-            db = VectorDatabase(
-                collection_name=collection_name,
-                persist_directory=persist_directory,
-                use_gpu=use_gpu,
-                logger=self.logger
-            )
-            
-            # Process each file
-            for i, file_path in enumerate(file_paths):
-                if self.stop_processing_flag.is_set():
-                    self.logger.info("Processing stopped by user")
-                    self.progress_tracker.update_task(main_task_id, status="Stopped by user")
-                    break
-                
-                try:
-                    # Update main task progress
-                    self.progress_tracker.update_task(
-                        main_task_id,
-                        current=i,
-                        status=f"Processing {Path(file_path).name}"
-                    )
-                    
-                    # Process file or directory
+            # Text extraction runs on this pool, ahead of the chunking and
+            # embedding done on this thread; the pipeline is not thread-safe
+            with ThreadPoolExecutor(
+                max_workers=settings.num_workers,
+                thread_name_prefix="aiembedder-extract"
+            ) as extract_pool:
+                # Paths are processed in the order they were selected. Each
+                # run of consecutive files is extracted on the pool ahead of
+                # embedding; a directory uses the pool for its own files
+                segments = []
+                for file_path in file_paths:
                     path = Path(file_path)
                     if path.is_file():
-                        self._process_single_file(path, pipeline, generator, db)
+                        if segments and isinstance(segments[-1], list):
+                            segments[-1].append(path)
+                        else:
+                            segments.append([path])
                     elif path.is_dir():
-                        self._process_directory(path, pipeline, generator, db)
+                        segments.append(path)
+                done = 0
+                task_state = self._task_state
+                monotonic = time.monotonic
+                last_progress = 0.0
+                
+                for segment in segments:
+                    if self._stop_requested:
+                        break
                     
-                except Exception as e:
-                    self.logger.error(f"Error processing {file_path}: {str(e)}")
-                    self.progress_tracker.add_error(main_task_id, f"Error processing {file_path}: {str(e)}")
+                    if isinstance(segment, Path):
+                        task_state[main_task_id] = (done, f"Processing {segment.name}")
+                        done += 1
+                        
+                        try:
+                            self._process_directory(segment, pipeline, generator, db, settings, extract_pool)
+                        except Exception as e:
+                            self.logger.error(f"Error processing {segment}: {str(e)}")
+                            self._worker_progress.add_error(main_task_id, f"Error processing {segment}: {str(e)}")
+                        continue
+                    
+                    # Chunks from several selected files share one embedding call
+                    batch = []
+                    batch_chunks = 0
+                    extracted = self._iter_extracted(
+                        segment, extract_pool, _EXTRACT_AHEAD * settings.num_workers, main_task_id
+                    )
+                    for _, path, text in extracted:
+                        if self._stop_requested:
+                            extracted.close()
+                            break
+                        
+                        # Update main task progress at most every
+                        # _PROGRESS_INTERVAL; the final count is set on completion
+                        now = monotonic()
+                        if now - last_progress >= _PROGRESS_INTERVAL:
+                            last_progress = now
+                            task_state[main_task_id] = (done, f"Processing {path.name}")
+                        done += 1
+                        
+                        chunks = self._process_single_file(path, text, pipeline, main_task_id)
+                        if chunks:
+                            batch.append((path, chunks))
+                            batch_chunks += len(chunks)
+                            if batch_chunks >= _EMBED_BATCH_CHUNKS:
+                                self._flush_batch(batch, generator, db, settings, main_task_id)
+                                batch = []
+                                batch_chunks = 0
+                    
+                    # Embed the rest of the run, including files chunked
+                    # before a stop
+                    if batch:
+                        self._flush_batch(batch, generator, db, settings, main_task_id)
+                
+                if self._stop_requested:
+                    self.logger.info("Processing stopped by user")
+                    self._worker_progress.update_task(main_task_id, status="Stopped by user")
             
-            # Complete main task
-            self.progress_tracker.update_task(main_task_id, current=len(file_paths), status="Completed")
-            self.progress_tracker.complete_task(main_task_id)
+            # Complete main task, dropping any progress not yet applied
+            self._task_state.pop(main_task_id, None)
+            self._worker_progress.update_task(main_task_id, current=len(file_paths), status="Completed")
+            self._worker_progress.complete_task(main_task_id)
             
             # Add completion message to queue
-            if not self.stop_processing_flag.is_set():
-                self.processing_queue.put(("complete", f"Successfully processed {len(file_paths)} files/directories."))
+            if not self._stop_requested:
+                self.processing_queue.append(("info_dialog", ("Processing Complete", f"Successfully processed {len(file_paths)} files/directories.")))
             
         except Exception as e:
             self.logger.error(f"Processing thread error: {str(e)}")
-            self.processing_queue.put(("error", str(e)))
+            self.processing_queue.append(("error_dialog", ("Processing Error", f"An error occurred: {str(e)}")))
         
         finally:
-            # Update UI state (via queue)
-            self.processing_queue.put(("update_ui", None))
+            # Reset UI state from process_queue; no Tk call is made here, so
+            # the thread can finish even after the window is destroyed
+            self.processing_queue.append(("processing_done", None))
+    
+    def _on_processing_done(self):
+        """Reset button states once the processing thread has finished."""
+        self._set_process_enabled(True)
+        self.stop_button.configure(state="disabled")
+    
+    def _get_vector_components(self, settings: ProcSettings) -> Tuple["VectorGenerator", "VectorDatabase"]:
+        """Get the vector generator and database for the current settings.
+        
+        Loading the embedding model and opening the database are slow, so
+        each is cached and reused by later runs until the settings it depends
+        on change. Changing the collection does not reload the model.
+        
+        Args:
+            settings: Processing settings
+            
+        Returns:
+            Tuple of vector generator and vector database
+        """
+        generator_key = (settings.embedding_model, settings.use_gpu)
+        generator = self._generator_cache.get(generator_key)
+        if generator is None:
+            from aiembedder.vector.generator import VectorGenerator
+            
+            # Drop the previous model before loading the next one
+            self._generator_cache.clear()
+            generator = VectorGenerator(
+                model_name=settings.embedding_model,
+                use_gpu=settings.use_gpu,
+                logger=self.logger
+            )
+            self._generator_cache[generator_key] = generator
+        
+        db_key = (settings.collection_name, settings.persist_directory, settings.use_gpu)
+        db = self._db_cache.get(db_key)
+        if db is None:
+            from aiembedder.vector.database import VectorDatabase
+            
+            self._db_cache.clear()
+            db = VectorDatabase(
+                collection_name=settings.collection_name,
+                persist_directory=settings.persist_directory,
+                use_gpu=settings.use_gpu,
+                logger=self.logger
+            )
+            self._db_cache[db_key] = db
+        
+        return generator, db
     
-    def _process_single_file(self, file_path: Path, pipeline: TextProcessingPipeline, 
-                            generator: VectorGenerator, db: VectorDatabase):
-        """Process a single file.
+    def _extract_text(self, file_path: Path, task_id: str) -> str:
+        """Extract the text of a single file.
+        
+        Runs on the extraction pool, so it only touches the processor for the
+        file; chunking is done by _process_single_file on the processing
+        thread.
         
         Args:
             file_path: File path
-            pipeline: Text processing pipeline
-            generator: Vector generator
-            db: Vector database
+            task_id: Task that records errors
+            
+        Returns:
+            Extracted text, empty if nothing could be extracted
         """
         try:
             self.logger.info(f"Processing file: {file_path}")
             
             # Get appropriate processor
-            self.logger.info(f"Getting processor for file type: {file_path.suffix}")
+            self.logger.debug(f"Getting processor for file type: {file_path.suffix}")
             processor = self.processor_factory.get_processor(file_path)
-            self.logger.info(f"Using processor: {processor.__class__.__name__}")
+            self.logger.debug(f"Using processor: {processor.__class__.__name__}")
             
             # Extract text
-            self.logger.info(f"Extracting text from file: {file_path}")
+            self.logger.debug(f"Extracting text from file: {file_path}")
             text = processor.process(str(file_path))  # Using process() method from BaseProcessor
-            text_length = len(text)
-            self.logger.info(f"Extracted {text_length} characters from file: {file_path}")
+            self.logger.info(f"Extracted {len(text)} characters from file: {file_path}")
             
-            if text_length == 0:
+            if not text:
                 self.logger.warning(f"No text extracted from file: {file_path}")
-                return
             
+            return text
+            
+        except Exception as e:
+            self._report_processing_error(f"Error processing file {file_path}", e, task_id)
+            return ""
+    
+    def _process_single_file(self, file_path: Path, text: str,
+                             pipeline: "TextProcessingPipeline",
+                             task_id: str) -> List[Dict[str, Any]]:
+        """Chunk the extracted text of a single file.
+        
+        The pipeline is not thread-safe, so this runs on the processing
+        thread only. Embedding and storage happen in _flush_batch so that
+        chunks from several files can share one embedding call.
+        
+        Args:
+            file_path: File path
+            text: Text extracted by _extract_text
+            pipeline: Text processing pipeline
+            task_id: Task that records errors
+            
+        Returns:
+            List of chunks, empty if nothing could be extracted
+        """
+        if not text:
+            return []
+        
+        try:
             # Process text
-            self.logger.info(f"Processing text through pipeline, length={text_length}")
+            self.logger.debug(f"Processing text through pipeline, length={len(text)}")
             chunks = pipeline.process_text(text, metadata={"source": str(file_path)})
             self.logger.info(f"Created {len(chunks)} chunks from file: {file_path}")
             
             if not chunks:
                 self.logger.warning(f"No chunks created from file: {file_path}")
-                return
+                return []
+            
+            return chunks
             
+        except Exception as e:
+            self._report_processing_error(f"Error processing file {file_path}", e, task_id)
+            return []
+    
+    def _flush_batch(self, batch: List[Tuple[Path, List[Dict[str, Any]]]],
+                     generator: "VectorGenerator", db: "VectorDatabase",
+                     settings: ProcSettings, task_id: str):
+        """Embed and store the chunks of a batch of files.
+        
+        Args:
+            batch: (file path, chunks) pairs
+            generator: Vector generator
+            db: Vector database
+            settings: Processing settings
+            task_id: Task that records errors
+        """
+        all_chunks = [chunk for _, chunks in batch for chunk in chunks]
+        
+        try:
             # Generate embeddings
-            self.logger.info(f"Generating embeddings for {len(chunks)} chunks")
-            chunks_with_embeddings = generator.generate_embeddings(chunks)
+            self.logger.info(f"Generating embeddings for {len(all_chunks)} chunks from {len(batch)} files")
+            chunks_with_embeddings = generator.generate_embeddings(all_chunks)
             self.logger.info(f"Generated embeddings for {len(chunks_with_embeddings)} chunks")
             
             if not chunks_with_embeddings:
-                self.logger.warning(f"No embeddings created for chunks from file: {file_path}")
+                self.logger.warning(f"No embeddings created for chunks from {len(batch)} files")
                 return
             
             # Add to database
@@ -615,52 +1004,47 @@ class MainWindow:
             db.add_chunks(chunks_with_embeddings)
             
             # Save chunks to disk for GPT4All localdocs
-            self.logger.info(f"Saving {len(chunks)} chunks to disk")
-            self._save_chunks_to_disk(file_path, chunks)
-            
-            self.logger.info(f"Completed processing file: {file_path}")
+            for file_path, chunks in batch:
+                self.logger.debug(f"Saving {len(chunks)} chunks to disk")
+                self._save_chunks_to_disk(file_path, chunks, settings.chunks_dir, settings.aggregated_chunks)
+                self.logger.info(f"Completed processing file: {file_path}")
             
         except Exception as e:
-            self.logger.error(f"Error processing file {file_path}: {str(e)}")
-            import traceback
-            self.logger.error(f"Stack trace:\n{traceback.format_exc()}")
-            
-            # Add error to task
-            task_ids = list(self.progress_tracker.get_all_tasks().keys())
-            if task_ids:
-                self.progress_tracker.add_error(task_ids[0], f"Error processing file {file_path}: {str(e)}")
-                
-            # Show error dialog
-            messagebox.showerror("Processing Error", f"Error processing file {file_path}:\n{str(e)}")
+            if len(batch) == 1:
+                self._report_processing_error(f"Error processing file {batch[0][0]}", e, task_id)
+            else:
+                self._report_processing_error(f"Error embedding {len(batch)} files", e, task_id)
     
-    def _save_chunks_to_disk(self, file_path: Path, chunks: List[Dict[str, Any]]):
+    def _report_processing_error(self, message: str, error: Exception, task_id: str):
+        """Log a processing error and report it to the user.
+        
+        Args:
+            message: Error context
+            error: Exception raised
+            task_id: Task to add the error to
+        """
+        self.logger.error(f"{message}: {error!r}")
+        if self.logger.is_enabled_for(logging.DEBUG):
+            self.logger.debug(f"Stack trace:\n{traceback.format_exc()}")
+        
+        # Add error to task
+        self._worker_progress.add_error(task_id, f"{message}: {str(error)}")
+            
+        # Called from worker threads, so the dialog is shown by process_queue
+        self.processing_queue.append(("error_dialog", ("Processing Error", f"{message}:\n{str(error)}")))
+    
+    def _save_chunks_to_disk(self, file_path: Path, chunks: List[Dict[str, Any]],
+                             output_dir: Path, aggregated: bool = False):
         """Save text chunks to disk for GPT4All localdocs.
         
         Args:
             file_path: Original file path
             chunks: List of text chunks with metadata
+            output_dir: Absolute chunks directory
+            aggregated: Write one JSONL file for the document instead of a
+                folder with one text file per chunk
         """
         try:
-            # Get chunks directory from config
-            chunks_dir_path = self.config.get("processing", "chunks_directory", "~/.aiembedder/chunks")
-            self.logger.info(f"Using chunks directory from config: {chunks_dir_path}")
-            
-            # Create absolute path - handle various path formats correctly
-            if chunks_dir_path.startswith("~/"):
-                output_dir = Path.home() / chunks_dir_path[2:]
-            else:
-                output_dir = Path(chunks_dir_path)
-                
-            output_dir = output_dir.resolve()
-            self.logger.info(f"Using absolute chunks directory path: {output_dir}")
-            
-            # Ensure main chunks directory exists
-            if not output_dir.exists():
-                self.logger.info(f"Creating chunks directory: {output_dir}")
-                output_dir.mkdir(parents=True, exist_ok=True)
-            else:
-                self.logger.info(f"Chunks directory already exists: {output_dir}")
-            
             # Create a unique, filesystem-safe folder name for this file
             file_name = file_path.stem
             parent_dir = file_path.parent.name
@@ -672,18 +1056,7 @@ class MainWindow:
                 folder_name = file_name
             
             # Windows-safe folder name (remove invalid chars)
-            folder_name = re.sub(r'[\\/*?:"<>|]', "_", folder_name)
-            
-            # Create full path for the folder
-            chunk_dir = output_dir / folder_name
-            self.logger.info(f"Creating chunk subfolder: {chunk_dir}")
-            
-            # Create the folder for this file's chunks
-            chunk_dir.mkdir(parents=True, exist_ok=True)
-            self.logger.info(f"Created chunk subfolder successfully: {chunk_dir}")
-            
-            # Save each chunk as a separate file
-            self.logger.info(f"Saving {len(chunks)} chunks to {chunk_dir}")
+            folder_name = folder_name.translate(_UNSAFE_FS_TRANS)
             
             # Extract document info to add as context to each chunk
             doc_info = {
@@ -702,49 +1075,142 @@ class MainWindow:
             except Exception as e:
                 self.logger.debug(f"Could not get file stats: {str(e)}")
             
+            last = len(chunks) - 1
+            
+            if aggregated:
+                # Save all chunks as one JSON line each in a single file next
+                # to the per-document folders
+                chunks_file = output_dir / f"{folder_name}{_AGGREGATED_CHUNKS_SUFFIX}"
+                self.logger.info(f"Saving {len(chunks)} chunks to {chunks_file}")
+                lines = []
+                for i, chunk in enumerate(chunks):
+                    headers = dict(doc_info)
+                    for key in ("cleaning_level", "chunk_size", "chunk_overlap"):
+                        if key in chunk:
+                            headers[key] = chunk[key]
+                    lines.append(json.dumps({
+                        "idx": i,
+                        "position": "BEGINNING" if i == 0 else "MIDDLE" if i < last else "END",
+                        "headers": headers,
+                        "text": chunk['text']
+                    }, ensure_ascii=False))
+                output_dir.mkdir(parents=True, exist_ok=True)
+                _write_chunk_file(chunks_file, "\n".join(lines) + "\n")
+                self.logger.info(f"Successfully saved {len(chunks)} chunks to {chunks_file}")
+                return
+            
+            # Create full path for the folder
+            chunk_dir = output_dir / folder_name
+            self.logger.info(f"Creating chunk subfolder: {chunk_dir}")
+            
+            # Create the folder for this file's chunks; process_files has
+            # already created output_dir, and parents=True covers it being
+            # removed since
+            chunk_dir.mkdir(parents=True, exist_ok=True)
+            self.logger.info(f"Created chunk subfolder successfully: {chunk_dir}")
+            
+            # Save each chunk as a separate file
+            self.logger.info(f"Saving {len(chunks)} chunks to {chunk_dir}")
+            
+            # Header lines shared by every chunk of the document are built
+            # once; each chunk file is then assembled and written in one call
+            document_line = f"# DOCUMENT: {doc_info['document_name']}\n"
+            document_lines = (
+                f"# TYPE: {doc_info['document_type']}\n"
+                f"# CREATED: {doc_info['created']}\n"
+                f"# SOURCE: {doc_info['document_path']}\n"
+            )
+            total_chunks = doc_info['total_chunks']
+            log_chunks = self.logger.is_enabled_for(logging.DEBUG)
+            chunk_files = []
+            contents = []
+            
             for i, chunk in enumerate(chunks):
                 # Create chunk filename with leading zeros for proper sorting
                 chunk_file = chunk_dir / f"chunk_{i:04d}.txt"
-                self.logger.debug(f"Saving chunk {i+1}/{len(chunks)} to {chunk_file}")
+                if log_chunks:
+                    self.logger.debug(f"Saving chunk {i+1}/{total_chunks} to {chunk_file}")
                 
-                with open(chunk_file, "w", encoding="utf-8") as f:
-                    # Add document context header - critical for better GPT4All embeddings
-                    f.write(f"# DOCUMENT: {doc_info['document_name']}\n")
-                    f.write(f"# CHUNK: {i+1} of {doc_info['total_chunks']}\n")
-                    f.write(f"# TYPE: {doc_info['document_type']}\n")
-                    f.write(f"# CREATED: {doc_info['created']}\n")
-                    
-                    # Add source path as reference
-                    f.write(f"# SOURCE: {doc_info['document_path']}\n")
-                    
-                    # Add chunk position indicators for GPT4All context
-                    position = "BEGINNING" if i == 0 else "MIDDLE" if i < len(chunks) - 1 else "END"
-                    f.write(f"# POSITION: {position}\n")
-                    
-                    # Add any additional metadata from the chunks dictionary
-                    # These come from the pipeline processing
-                    if 'cleaning_level' in chunk:
-                        f.write(f"# CLEANING: {chunk['cleaning_level']}\n")
-                    if 'chunk_size' in chunk:
-                        f.write(f"# TOKENS_PER_CHUNK: {chunk['chunk_size']}\n")
-                    if 'chunk_overlap' in chunk:
-                        f.write(f"# OVERLAP_TOKENS: {chunk['chunk_overlap']}\n")
-                    
-                    # Add a separator for better visual parsing
-                    f.write("\n---\n\n")
-                    
-                    # Write the actual text content
-                    f.write(chunk['text'])
+                # Add document context header - critical for better GPT4All
+                # embeddings - with the source path as reference and the
+                # chunk position for GPT4All context
+                position = "BEGINNING" if i == 0 else "MIDDLE" if i < last else "END"
+                parts = [
+                    document_line,
+                    f"# CHUNK: {i+1} of {total_chunks}\n",
+                    document_lines,
+                    f"# POSITION: {position}\n"
+                ]
+                
+                # Add any additional metadata from the chunks dictionary
+                # These come from the pipeline processing
+                if 'cleaning_level' in chunk:
+                    parts.append(f"# CLEANING: {chunk['cleaning_level']}\n")
+                if 'chunk_size' in chunk:
+                    parts.append(f"# TOKENS_PER_CHUNK: {chunk['chunk_size']}\n")
+                if 'chunk_overlap' in chunk:
+                    parts.append(f"# OVERLAP_TOKENS: {chunk['chunk_overlap']}\n")
+                
+                # Add a separator for better visual parsing, then the text
+                parts.append("\n---\n\n")
+                parts.append(chunk['text'])
+                
+                chunk_files.append(chunk_file)
+                contents.append("".join(parts))
+            
+            # Issue the writes together so the open/write/close calls of
+            # different files overlap; a single file is written directly.
+            # Collecting the results re-raises the first write error
+            if len(chunk_files) > 1:
+                list(self._write_pool.map(_write_chunk_file, chunk_files, contents))
+            elif chunk_files:
+                _write_chunk_file(chunk_files[0], contents[0])
             
             self.logger.info(f"Successfully saved {len(chunks)} chunks to {chunk_dir}")
             
         except Exception as e:
             self.logger.error(f"Error saving chunks to disk: {str(e)}")
-            import traceback
-            self.logger.error(f"Stack trace:\n{traceback.format_exc()}")
+            if self.logger.is_enabled_for(logging.DEBUG):
+                self.logger.debug(f"Stack trace:\n{traceback.format_exc()}")
+    
+    def _iter_extracted(self, files: List[Path], extract_pool: ThreadPoolExecutor,
+                        window: int, task_id: str) -> Iterator[Tuple[int, Path, str]]:
+        """Extract text from files on a thread pool, yielding results in order.
+        
+        At most window files are in flight, so extraction runs ahead of the
+        consumer without holding every file's text in memory. Pending
+        extractions are cancelled when the generator is closed.
+        
+        Args:
+            files: File paths
+            extract_pool: Thread pool for extraction
+            window: Maximum number of files in flight
+            task_id: Task that records extraction errors
+            
+        Yields:
+            (index, file path, text) tuples
+        """
+        pending = deque()
+        remaining = enumerate(files)
+        
+        def submit(count):
+            for i, file_path in islice(remaining, count):
+                future = extract_pool.submit(self._extract_text, file_path, task_id)
+                pending.append((i, file_path, future))
+        
+        submit(window)
+        try:
+            while pending:
+                i, file_path, future = pending.popleft()
+                submit(1)
+                yield i, file_path, future.result()
+        finally:
+            for _, _, future in pending:
+                future.cancel()
     
-    def _process_directory(self, dir_path: Path, pipeline: TextProcessingPipeline,
-                          generator: VectorGenerator, db: VectorDatabase):
+    def _process_directory(self, dir_path: Path, pipeline: "TextProcessingPipeline",
+                          generator: "VectorGenerator", db: "VectorDatabase",
+                          settings: ProcSettings, extract_pool: ThreadPoolExecutor):
         """Process a directory.
         
         Args:
@@ -752,97 +1218,181 @@ class MainWindow:
             pipeline: Text processing pipeline
             generator: Vector generator
             db: Vector database
+            settings: Processing settings
+            extract_pool: Thread pool for text extraction
         """
         self.logger.info(f"Processing directory: {dir_path}")
         
         try:
             # Create directory task
-            dir_task_id = self.progress_tracker.start_task(
+            dir_task_id = self._worker_progress.start_task(
                 f"dir_{dir_path.name}",
                 total=100,  # Initialize with default value
                 status=f"Scanning directory {dir_path.name}"
             )
             
-            # Get all files
-            files = []
-            for ext in [".txt", ".html", ".htm", ".pdf", ".doc", ".docx"]:
-                files.extend(dir_path.glob(f"**/*{ext}"))
+            # Get all files up front; the count drives the progress percentage
+            files = list(_iter_directory_files(dir_path))
             
             # Update the status with file count
             self.logger.info(f"Found {len(files)} files in directory: {dir_path}")
-            self.progress_tracker.update_task(
+            self._worker_progress.update_task(
                 dir_task_id, 
                 current=0,
                 status=f"Found {len(files)} files to process"
             )
             
-            # Process each file
-            for i, file_path in enumerate(files):
-                if self.stop_processing_flag.is_set():
+            # Process each file, embedding chunks from several files at once
+            # while later files are extracted in the background
+            batch = []
+            batch_chunks = 0
+            file_count = len(files)
+            task_state = self._task_state
+            monotonic = time.monotonic
+            last_progress = 0.0
+            extracted = self._iter_extracted(
+                files, extract_pool, _EXTRACT_AHEAD * settings.num_workers, dir_task_id
+            )
+            for i, file_path, text in extracted:
+                if self._stop_requested:
+                    extracted.close()
                     break
                 
-                try:
-                    # Calculate percentage of completion for progress
-                    current_progress = int((i / len(files)) * 100) if files else 0
-                    
-                    self.progress_tracker.update_task(
-                        dir_task_id,
-                        current=current_progress,
-                        status=f"Processing {file_path.name} ({i+1}/{len(files)})"
+                # Only build the status text as often as the UI applies it
+                now = monotonic()
+                if now - last_progress >= _PROGRESS_INTERVAL:
+                    last_progress = now
+                    task_state[dir_task_id] = (
+                        int((i / file_count) * 100),
+                        f"Processing {file_path.name} ({i+1}/{file_count})"
                     )
-                    
-                    self._process_single_file(file_path, pipeline, generator, db)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing {file_path}: {str(e)}")
-                    self.progress_tracker.add_error(dir_task_id, f"Error processing {file_path}: {str(e)}")
+                
+                chunks = self._process_single_file(file_path, text, pipeline, dir_task_id)
+                if chunks:
+                    batch.append((file_path, chunks))
+                    batch_chunks += len(chunks)
+                    if batch_chunks >= _EMBED_BATCH_CHUNKS:
+                        self._flush_batch(batch, generator, db, settings, dir_task_id)
+                        batch = []
+                        batch_chunks = 0
             
-            # Complete directory task
-            self.progress_tracker.update_task(
+            # Embed the rest of the directory, including files chunked
+            # before a stop
+            if batch:
+                self._flush_batch(batch, generator, db, settings, dir_task_id)
+            
+            # Complete directory task, dropping any progress not yet applied
+            self._task_state.pop(dir_task_id, None)
+            self._worker_progress.update_task(
                 dir_task_id, 
                 current=100,  # Set to 100% complete
                 status=f"Completed processing {len(files)} files"
             )
-            self.progress_tracker.complete_task(dir_task_id)
+            self._worker_progress.complete_task(dir_task_id)
             
         except Exception as e:
             self.logger.error(f"Error processing directory {dir_path}: {str(e)}")
-            import traceback
-            self.logger.error(f"Stack trace:\n{traceback.format_exc()}")
+            if self.logger.is_enabled_for(logging.DEBUG):
+                self.logger.debug(f"Stack trace:\n{traceback.format_exc()}")
             
             # Add error if task was created
             if 'dir_task_id' in locals():
-                self.progress_tracker.add_error(dir_task_id, f"Error processing directory {dir_path}: {str(e)}")
+                self._worker_progress.add_error(dir_task_id, f"Error processing directory {dir_path}: {str(e)}")
             
             raise
     
     def process_queue(self):
         """Process the queue of UI updates from the processing thread."""
-        try:
-            while not self.processing_queue.empty():
-                message_type, message = self.processing_queue.get_nowait()
-                
-                if message_type == "complete":
-                    messagebox.showinfo("Processing Complete", message)
-                elif message_type == "error":
-                    messagebox.showerror("Processing Error", f"An error occurred: {message}")
-                elif message_type == "update_ui":
-                    # Update UI state
-                    self.process_button.configure(state="normal")
-                    self.stop_button.configure(state="disabled")
-                
-        except queue.Empty:
-            pass
+        busy = False
         
-        # Schedule next queue check
-        self.root.after(100, self.process_queue)
+        # Drain a bounded batch per tick so a flood of messages cannot starve
+        # the Tk event loop
+        for _ in range(_QUEUE_DRAIN_LIMIT):
+            try:
+                message_type, message = self.processing_queue.popleft()
+            except IndexError:
+                break
+            busy = True
+            
+            # Dialog messages carry a (title, text) pair, progress messages a
+            # (tracker method name, arguments) pair
+            if message_type == "progress":
+                method, args = message
+                getattr(self.progress_tracker, method)(*args)
+            elif message_type == "info_dialog":
+                messagebox.showinfo(*message)
+            elif message_type == "warn_dialog":
+                messagebox.showwarning(*message)
+            elif message_type == "error_dialog":
+                messagebox.showerror(*message)
+            elif message_type == "processing_done":
+                self._on_processing_done()
+            elif message_type == "reset_done":
+                self._on_reset_done()
+        
+        # Apply the latest coalesced progress of each running task; tasks
+        # whose start has not been applied yet are skipped
+        while self._task_state:
+            try:
+                task_id, (current, status) = self._task_state.popitem()
+            except KeyError:
+                break
+            busy = True
+            state = self.progress_tracker.get_task(task_id)
+            if state is not None and state.end_time is None:
+                self.progress_tracker.update_task(task_id, current=current, status=status)
+        
+        # Schedule next queue check, backing off while idle
+        if busy:
+            self._poll_ms = _QUEUE_POLL_MIN_MS
+        else:
+            self._poll_ms = min(self._poll_ms * 2, _QUEUE_POLL_MAX_MS)
+        self.root.after(self._poll_ms, self.process_queue)
+    
+    def _get_chunks_dir(self) -> Path:
+        """Get the absolute chunks directory, creating it if needed.
+        
+        The path is resolved and created once, then cached until the settings
+        change.
+        
+        Returns:
+            Chunks directory
+        """
+        if self._chunks_dir is None:
+            # Get chunks directory directly from config dictionary
+            if "processing" in self.config.config and "chunks_directory" in self.config.config["processing"]:
+                chunks_dir_path = self.config.config["processing"]["chunks_directory"]
+            else:
+                chunks_dir_path = "~/.aiembedder/chunks"  # Use default only if not found
+                # Set it in config
+                self.config.set("processing", "chunks_directory", chunks_dir_path)
+                self.logger.info(f"Set chunks_directory in config: {chunks_dir_path}")
+            
+            chunks_dir = Path(chunks_dir_path).expanduser().resolve()
+            chunks_dir.mkdir(parents=True, exist_ok=True)
+            self.logger.info(f"Using chunks directory: {chunks_dir}")
+            self._chunks_dir = chunks_dir
+        
+        return self._chunks_dir
+    
+    def _is_processing(self) -> bool:
+        """Check whether a processing run is pending or running.
+        
+        Returns:
+            True if the current run has not finished
+        """
+        return self._current_future is not None and not self._current_future.done()
     
     def stop_processing(self):
         """Stop processing."""
-        if self.processing_thread and self.processing_thread.is_alive():
+        if self._is_processing():
             if messagebox.askyesno("Stop Processing", "Are you sure you want to stop processing?"):
                 self.logger.info("Stopping processing...")
-                self.stop_processing_flag.set()
+                self._stop_requested = True
+                # A run that has not started yet never reaches its cleanup
+                if self._current_future.cancel():
+                    self._on_processing_done()
+                    return
                 
                 # Update button state (full UI update will happen when thread ends)
                 self.stop_button.configure(state="disabled") 
@@ -892,25 +1442,31 @@ class MainWindow:
                     messagebox.showerror("Error", f"Failed to create chunks directory: {str(e)}")
             return
         
-        # Get all chunk directories and files
-        chunk_dirs = [d for d in chunks_dir.iterdir() if d.is_dir()]
-        
-        if not chunk_dirs:
+        # Count the chunks of each document, saved either as a folder of
+        # text files or as one JSONL file with a line per chunk
+        dir_stats = []
+        total_chunks = 0
+        with os.scandir(chunks_dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    name = entry.name
+                    file_count = len(list(Path(entry.path).glob("*.txt")))
+                elif entry.name.endswith(_AGGREGATED_CHUNKS_SUFFIX) and entry.is_file():
+                    name = entry.name[:-len(_AGGREGATED_CHUNKS_SUFFIX)]
+                    with open(entry.path, "rb") as f:
+                        file_count = sum(1 for _ in f)
+                else:
+                    continue
+                total_chunks += file_count
+                dir_stats.append(f"{name}: {file_count} chunks")
+        
+        if not dir_stats:
             result = messagebox.askyesno("Chunks Folder", 
                                        f"The chunks folder is empty: {chunks_dir}\n\nDo you want to open it?")
             if result:
                 self.open_folder(chunks_dir)
             return
         
-        # Count files in each directory
-        dir_stats = []
-        total_chunks = 0
-        for dir in chunk_dirs:
-            chunk_files = list(dir.glob("*.txt"))
-            file_count = len(chunk_files)
-            total_chunks += file_count
-            dir_stats.append(f"{dir.name}: {file_count} chunks")
-        
         # Show results
         result_text = f"Chunks folder: {chunks_dir}\n\n"
         result_text += f"Total chunks: {total_chunks}\n"
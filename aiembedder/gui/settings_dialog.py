@@ -220,6 +220,14 @@ class SettingsDialog:
         )
         self.gpt4all_check.pack(anchor=tk.W)
         
+        self.aggregated_var = tk.BooleanVar(value=False)
+        self.aggregated_check = ttk.Checkbutton(
+            self.gpt4all_frame, 
+            text="Save each document's chunks as one JSONL file", 
+            variable=self.aggregated_var
+        )
+        self.aggregated_check.pack(anchor=tk.W)
+        
         # GPT4All info 
         self.gpt4all_info_frame = ttk.Frame(self.processing_frame)
         self.gpt4all_info_frame.pack(fill=tk.X, pady=(0, 5))
@@ -346,6 +354,7 @@ class SettingsDialog:
         self.chunks_dir_var.set(self.config.get("processing", "chunks_directory", "~/.aiembedder/chunks"))
         self.gpu_var.set(self.config.get("processing", "use_gpu", True))
         self.gpt4all_optimize_var.set(self.config.get("processing", "optimize_for_gpt4all", True))
+        self.aggregated_var.set(self.config.get("processing", "aggregated_chunks", False))
         self.structure_var.set(self.config.get("processing", "respect_document_structure", True))
         self.flexibility_var.set(self.config.get("processing", "chunk_flexibility_percent", 30))
         
@@ -375,6 +384,7 @@ class SettingsDialog:
         self.config.set("processing", "chunks_directory", self.chunks_dir_var.get())
         self.config.set("processing", "use_gpu", self.gpu_var.get())
         self.config.set("processing", "optimize_for_gpt4all", self.gpt4all_optimize_var.get())
+        self.config.set("processing", "aggregated_chunks", self.aggregated_var.get())
         self.config.set("processing", "respect_document_structure", self.structure_var.get())
         self.config.set("processing", "chunk_flexibility_percent", self.flexibility_var.get())
         
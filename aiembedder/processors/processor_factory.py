@@ -2,7 +2,7 @@
 Processor factory for AIEmbedder.
 """
 
-from pathlib import Path
+import os
 from typing import Dict, Optional, Type
 
 from aiembedder.processors.base_processor import BaseProcessor
@@ -34,6 +34,14 @@ class ProcessorFactory:
             logger: Logger instance
         """
         self.logger = logger or Logger()
+        
+        # Processors are stateless, so one instance per class serves every file
+        instances: Dict[Type[BaseProcessor], BaseProcessor] = {}
+        self.by_ext: Dict[str, BaseProcessor] = {
+            extension: instances.setdefault(processor_class, processor_class(self.logger))
+            for extension, processor_class in self.PROCESSORS.items()
+        }
+        
         self.logger.info("Initialized processor factory")
     
     def get_processor(self, file_path: str) -> BaseProcessor:
@@ -48,16 +56,16 @@ class ProcessorFactory:
         Raises:
             ProcessingError: If no processor is available for file type
         """
-        extension = Path(file_path).suffix.lower()
+        extension = os.path.splitext(file_path)[1].lower()
         
-        if extension not in self.PROCESSORS:
+        processor = self.by_ext.get(extension)
+        if processor is None:
             raise ProcessingError(
                 f"No processor available for file type: {extension}",
                 "PROC_001"
             )
         
-        processor_class = self.PROCESSORS[extension]
-        return processor_class(self.logger)
+        return processor
     
     def get_supported_extensions(self) -> list[str]:
         """Get list of supported file extensions.
@@ -76,5 +84,5 @@ class ProcessorFactory:
         Returns:
             True if file type is supported
         """
-        extension = Path(file_path).suffix.lower()
-        return extension in self.PROCESSORS 
\ No newline at end of file
+        extension = os.path.splitext(file_path)[1].lower()
+        return extension in self.by_ext 
\ No newline at end of file
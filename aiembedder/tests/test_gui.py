@@ -2,8 +2,13 @@
 Tests for GUI components.
 """
 
+import json
+import logging
 import pytest
 import tkinter as tk
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from aiembedder.utils.config import Config
@@ -12,25 +17,35 @@ from aiembedder.utils.progress import ProgressTracker, ProgressState
 from aiembedder.gui.settings_dialog import SettingsDialog
 from aiembedder.gui.progress_panel import ProgressPanel
 from aiembedder.gui.log_panel import LogPanel, LogHandler
+from aiembedder.gui.main_window import MainWindow, ProcSettings, _QueuedProgress
 
 # Skip tests if no display available
 pytestmark = pytest.mark.skipif("not hasattr(tk, '_default_root')", reason="No display available")
 
+def _make_log_panel():
+    """Create a log panel with mocked Tk variables and widgets."""
+    def create_widgets(panel):
+        panel.main_frame = MagicMock()
+        panel.log_text = MagicMock()
+        panel.log_scrollbar = MagicMock()
+        panel.status_bar = MagicMock()
+    
+    with patch("tkinter.StringVar", MagicMock()), patch("tkinter.BooleanVar", MagicMock()):
+        with patch.object(LogPanel, "create_widgets", create_widgets):
+            with patch.object(LogPanel, "setup_layout"):
+                return LogPanel(MagicMock(), MagicMock())
+
 class TestLogComponents:
     """Test log components."""
     
     def test_log_handler(self):
         """Test log handler."""
-        # Create mock callback
-        callback = MagicMock()
-        
-        # Create handler with mock callback
-        handler = LogHandler(callback)
+        # Create handler with a plain deque
+        log_queue = deque()
+        handler = LogHandler(log_queue)
         
         # Create log record
-        record = MagicMock()
-        record.getMessage.return_value = "Test message"
-        record.levelname = "INFO"
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "Test %s", ("message",), None)
         
         # Mock format method
         handler.format = MagicMock(return_value="Formatted log message")
@@ -38,9 +53,10 @@ class TestLogComponents:
         # Emit record
         handler.emit(record)
         
-        # Verify callback was called with formatted message
-        handler.format.assert_called_once_with(record)
-        callback.assert_called_once_with("Formatted log message")
+        # Verify the raw record was queued without formatting
+        handler.format.assert_not_called()
+        assert list(log_queue) == [record]
+        assert record.args == ("message",)
     
     def test_get_tag_for_entry(self, monkeypatch):
         """Test getting tag for log entry."""
@@ -49,7 +65,7 @@ class TestLogComponents:
         parent = MagicMock()
         
         # Create log panel
-        with patch("tkinter.scrolledtext.ScrolledText", MagicMock()):
+        with patch("tkinter.Text", MagicMock()):
             log_panel = LogPanel(parent, logger)
         
         # Test tag for different log levels
@@ -59,6 +75,78 @@ class TestLogComponents:
         assert log_panel.get_tag_for_entry("2022-01-01 [ERROR] test: message") == "error"
         assert log_panel.get_tag_for_entry("2022-01-01 [CRITICAL] test: message") == "critical"
         assert log_panel.get_tag_for_entry("Other message") == "default"
+    
+    def test_render_visible_window(self):
+        """Test that only the visible window of entries is rendered."""
+        log_panel = _make_log_panel()
+        log_panel.destroy()
+        log_panel.visible_rows = 3
+        
+        # Auto-scroll follows the newest entries
+        log_panel.add_log_entries([("info", f"line {i}") for i in range(10)])
+        assert log_panel.first_row == 7
+        log_panel.log_text.insert.assert_called_with(tk.END, "line 7\nline 8\nline 9\n", "info")
+        
+        # Consecutive entries with different tags are inserted as separate runs
+        log_panel.add_log_entries([("error", "failed")])
+        log_panel.log_text.insert.assert_called_with(
+            tk.END, "line 8\nline 9\n", "info", "failed\n", "error"
+        )
+    
+    def test_scroll_past_max_lines(self):
+        """Test scrolling and eviction once more than max_lines are logged."""
+        log_panel = _make_log_panel()
+        log_panel.destroy()
+        log_panel.max_lines = 10
+        log_panel.entries = deque(maxlen=10)
+        log_panel.visible_rows = 3
+        log_panel._cached_auto_scroll = False
+        
+        log_panel.add_log_entries([("info", f"line {i}") for i in range(10)])
+        
+        # Scrolling is clamped to the retained entries
+        log_panel.scroll_to(100)
+        assert log_panel.first_row == 7
+        log_panel.scroll_to(-5)
+        assert log_panel.first_row == 0
+        log_panel.scroll_to(4)
+        
+        # Evicting old entries keeps the same entries in view
+        log_panel.add_log_entries([("info", f"line {i}") for i in range(10, 14)])
+        assert len(log_panel.entries) == 10
+        assert log_panel.first_row == 0
+        assert log_panel.entries[log_panel.first_row] == ("info", "line 4")
+        assert log_panel.status_bar.config.call_args == ((), {"text": "10 log entries"})
+    
+    def test_handler_level_follows_panel_level(self):
+        """Test that the handler only queues records at the panel level."""
+        log_panel = _make_log_panel()
+        try:
+            logger = logging.getLogger("aiembedder.tests.log_panel")
+            logger.setLevel(logging.DEBUG)
+            assert log_panel.handler.level == logging.INFO
+            
+            log_panel.level_var.get.return_value = "WARNING"
+            log_panel.on_level_change(None)
+            assert log_panel.handler.level == logging.WARNING
+            
+            logger.info("Not queued")
+            logger.warning("Queued")
+            assert [record.getMessage() for record in log_panel.log_queue] == ["Queued"]
+        finally:
+            log_panel.destroy()
+    
+    def test_destroy(self):
+        """Test that destroy detaches the handler and cancels the next drain."""
+        log_panel = _make_log_panel()
+        update_job = log_panel._update_job
+        assert log_panel.handler in logging.getLogger().handlers
+        
+        log_panel.destroy()
+        
+        assert log_panel.handler not in logging.getLogger().handlers
+        log_panel.parent.after_cancel.assert_called_once_with(update_job)
+        log_panel.main_frame.destroy.assert_called_once()
 
 class TestProgressComponents:
     """Test progress components."""
@@ -155,4 +243,165 @@ class TestSettingsDialog:
                             config.get.assert_any_call("gui.theme", "default")
                             config.get.assert_any_call("gui.log_level", "INFO")
                             config.get.assert_any_call("advanced.log_directory", "~/.aiembedder/logs")
-                            config.get.assert_any_call("advanced.model_name", "all-MiniLM-L6-v2") 
\ No newline at end of file
+                            config.get.assert_any_call("advanced.model_name", "all-MiniLM-L6-v2") 
+
+def _make_main_window():
+    """Create a main window without Tk, holding only what processing uses."""
+    window = MainWindow.__new__(MainWindow)
+    window.logger = MagicMock()
+    window.processing_queue = deque()
+    window._worker_progress = _QueuedProgress(window.processing_queue)
+    window._task_state = {}
+    window._stop_requested = False
+    window._write_pool = ThreadPoolExecutor(max_workers=2)
+    return window
+
+def _make_settings(chunks_dir, aggregated_chunks=False):
+    """Create processing settings for tests."""
+    return ProcSettings(
+        cleaning_level="medium",
+        chunk_size=400,
+        chunk_overlap=50,
+        similarity_threshold=0.95,
+        use_gpu=False,
+        optimize_for_gpt4all=True,
+        chunks_dir=chunks_dir,
+        aggregated_chunks=aggregated_chunks,
+        num_workers=2,
+        collection_name="test_collection",
+        persist_directory="/test/db",
+        embedding_model="test-model"
+    )
+
+class TestMainWindowProcessing:
+    """Test main window processing."""
+    
+    def test_flush_batch_groups_chunks_by_file(self, tmp_path):
+        """Test that a batch spanning several files saves each file's chunks."""
+        window = _make_main_window()
+        window._save_chunks_to_disk = MagicMock()
+        
+        # Stub generator adds an embedding to each chunk
+        generator = MagicMock()
+        generator.generate_embeddings.side_effect = lambda chunks: [
+            {**chunk, "embedding": [0.0]} for chunk in chunks
+        ]
+        db = MagicMock()
+        
+        first = [{"text": "a1"}, {"text": "a2"}]
+        second = [{"text": "b1"}]
+        batch = [(tmp_path / "a.txt", first), (tmp_path / "b.txt", second)]
+        window._flush_batch(batch, generator, db, _make_settings(tmp_path), "task")
+        window._write_pool.shutdown()
+        
+        # One embedding call and one database call for the whole batch
+        generator.generate_embeddings.assert_called_once_with(first + second)
+        db.add_chunks.assert_called_once()
+        assert [chunk["text"] for chunk in db.add_chunks.call_args[0][0]] == ["a1", "a2", "b1"]
+        
+        # Each file's chunks are saved under that file
+        saved = [(call[0][0].name, call[0][1]) for call in window._save_chunks_to_disk.call_args_list]
+        assert saved == [("a.txt", first), ("b.txt", second)]
+    
+    def test_stop_flushes_chunked_files(self, tmp_path):
+        """Test that files chunked before a stop are still embedded and saved."""
+        source_dir = tmp_path / "docs"
+        source_dir.mkdir()
+        for name in ("a.txt", "b.txt", "c.txt"):
+            (source_dir / name).write_text(name, encoding="utf-8")
+        
+        window = _make_main_window()
+        window._save_chunks_to_disk = MagicMock()
+        processor = MagicMock()
+        processor.process.side_effect = lambda path: Path(path).read_text(encoding="utf-8")
+        window.processor_factory = MagicMock()
+        window.processor_factory.get_processor.return_value = processor
+        
+        # Stop is requested while the first file is being chunked
+        def process_text(text, metadata):
+            window._stop_requested = True
+            return [{"text": text, **metadata}]
+        
+        pipeline = MagicMock()
+        pipeline.process_text.side_effect = process_text
+        generator = MagicMock()
+        generator.generate_embeddings.side_effect = lambda chunks: chunks
+        db = MagicMock()
+        
+        with ThreadPoolExecutor(max_workers=2) as extract_pool:
+            window._process_directory(
+                source_dir, pipeline, generator, db, _make_settings(tmp_path / "chunks"), extract_pool
+            )
+        window._write_pool.shutdown()
+        
+        # Only the file chunked before the stop is processed, and it is kept
+        assert pipeline.process_text.call_count == 1
+        generator.generate_embeddings.assert_called_once()
+        db.add_chunks.assert_called_once()
+        assert window._save_chunks_to_disk.call_count == 1
+    
+    def test_save_chunks_aggregated(self, tmp_path):
+        """Test saving a document's chunks as one JSONL file."""
+        source = tmp_path / "docs" / "report.txt"
+        source.parent.mkdir()
+        source.write_text("report", encoding="utf-8")
+        chunks = [{"text": "first", "chunk_size": 400}, {"text": "second"}, {"text": "third"}]
+        
+        window = _make_main_window()
+        output_dir = tmp_path / "chunks"
+        window._save_chunks_to_disk(source, chunks, output_dir, aggregated=True)
+        window._write_pool.shutdown()
+        
+        # One line per chunk, and no per-chunk folder
+        chunks_file = output_dir / "docs_report.chunks.jsonl"
+        records = [json.loads(line) for line in chunks_file.read_text(encoding="utf-8").splitlines()]
+        assert not (output_dir / "docs_report").exists()
+        assert [record["idx"] for record in records] == [0, 1, 2]
+        assert [record["position"] for record in records] == ["BEGINNING", "MIDDLE", "END"]
+        assert [record["text"] for record in records] == ["first", "second", "third"]
+        assert records[0]["headers"]["document_name"] == "report.txt"
+        assert records[0]["headers"]["total_chunks"] == 3
+        assert records[0]["headers"]["chunk_size"] == 400
+        assert "chunk_size" not in records[1]["headers"]
+    
+    def test_save_chunks_per_file(self, tmp_path):
+        """Test that the default layout still writes one text file per chunk."""
+        source = tmp_path / "docs" / "report.txt"
+        source.parent.mkdir()
+        source.write_text("report", encoding="utf-8")
+        chunks = [{"text": "first"}, {"text": "second"}]
+        
+        window = _make_main_window()
+        output_dir = tmp_path / "chunks"
+        window._save_chunks_to_disk(source, chunks, output_dir)
+        window._write_pool.shutdown()
+        
+        chunk_dir = output_dir / "docs_report"
+        assert sorted(path.name for path in chunk_dir.iterdir()) == ["chunk_0000.txt", "chunk_0001.txt"]
+        assert not (output_dir / "docs_report.chunks.jsonl").exists()
+        
+        content = (chunk_dir / "chunk_0001.txt").read_text(encoding="utf-8")
+        assert content.startswith("# DOCUMENT: report.txt\n# CHUNK: 2 of 2\n")
+        assert "# POSITION: END\n" in content
+        assert content.endswith("\n---\n\nsecond")
+    
+    def test_check_chunks_folder_counts_both_layouts(self, tmp_path):
+        """Test counting chunk files and JSONL lines in the chunks folder."""
+        chunk_dir = tmp_path / "docs_a"
+        chunk_dir.mkdir()
+        for i in range(3):
+            (chunk_dir / f"chunk_{i:04d}.txt").write_text("chunk", encoding="utf-8")
+        (tmp_path / "docs_b.chunks.jsonl").write_text('{"idx": 0}\n{"idx": 1}\n', encoding="utf-8")
+        
+        window = _make_main_window()
+        window._write_pool.shutdown()
+        window.config = MagicMock()
+        window.config.config = {"processing": {"chunks_directory": str(tmp_path)}}
+        window.show_chunks_dialog = MagicMock()
+        window.check_chunks_folder()
+        
+        text = window.show_chunks_dialog.call_args[0][1]
+        assert "Total chunks: 5\n" in text
+        assert "Source documents: 2\n" in text
+        assert "docs_a: 3 chunks" in text
+        assert "docs_b: 2 chunks" in text
@@ -134,6 +134,10 @@ def test_processor_factory():
         assert isinstance(factory.get_processor(pdf_file), PDFProcessor)
         assert isinstance(factory.get_processor(txt_file), TextProcessor)
         
+        # Test processor instances are reused per type
+        assert factory.get_processor(txt_file) is factory.get_processor(txt_file)
+        assert factory.get_processor(html_file) is factory.get_processor(os.path.join(temp_dir, "test.htm"))
+        
         # Test unsupported file type
         with pytest.raises(ProcessingError):
             factory.get_processor(os.path.join(temp_dir, "test.xyz"))
@@ -2,6 +2,7 @@
 Tests for utility modules.
 """
 
+import logging
 import os
 import tempfile
 from datetime import datetime
@@ -66,6 +67,18 @@ def test_logger_initialization():
         log_files = list(Path(temp_dir).glob("*.log"))
         assert len(log_files) > 0
 
+def test_logger_is_enabled_for():
+    """Test Logger level checks."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        logger = Logger(temp_dir)
+        
+        logger.set_level("ERROR")
+        assert not logger.is_enabled_for(logging.DEBUG)
+        assert logger.is_enabled_for(logging.ERROR)
+        
+        logger.set_level("DEBUG")
+        assert logger.is_enabled_for(logging.DEBUG)
+
 # Test Error Handling
 def test_error_handling():
     """Test error handling."""
@@ -41,6 +41,8 @@ class Config:
                 "use_gpu": True,
                 "chunks_directory": str(Path.home() / ".aiembedder" / "chunks"),
                 "optimize_for_gpt4all": True,
+                "aggregated_chunks": False,
+                "num_workers": min(8, os.cpu_count() or 1),
                 "respect_document_structure": True,
                 "chunk_flexibility_percent": 30
             },
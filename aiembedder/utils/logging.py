@@ -90,6 +90,17 @@ class Logger:
         """
         self.logger.critical(message)
     
+    def is_enabled_for(self, level: int) -> bool:
+        """Check whether messages of a level would be logged.
+        
+        Args:
+            level: Logging level number
+            
+        Returns:
+            True if the level is enabled
+        """
+        return self.logger.isEnabledFor(level)
+    
     def set_level(self, level: str) -> None:
         """Set logging level.
         
@@ -58,13 +58,16 @@ class ProgressTracker:
         self.callbacks: Dict[str, List[Callable[[str, ProgressState], None]]] = {}
         self.global_callbacks: List[Callable[[str, ProgressState], None]] = []
     
-    def start_task(self, task_id: str, total: int, status: str = "Starting...") -> None:
+    def start_task(self, task_id: str, total: int, status: str = "Starting...") -> str:
         """Start a new task.
         
         Args:
             task_id: Task identifier
             total: Total number of items
             status: Initial status message
+            
+        Returns:
+            Task identifier
         """
         self.tasks[task_id] = ProgressState(
             total=total,
@@ -73,6 +76,7 @@ class ProgressTracker:
             start_time=datetime.now()
         )
         self._notify_callbacks(task_id)
+        return task_id
     
     def update_task(self, task_id: str, current: int = None, status: str = None) -> None:
         """Update task progress.